@@ -26,8 +26,8 @@ class Config:
                  rotate_to_rtz=False, unit_output="DISP",  component_list=None,
                  adj_src_type="cc_traveltime", observed_tag="observed",
                  synthetic_tag=None, st_obs_type="obs", st_syn_type="syn",
-                 win_amp_ratio=0., pyflex_parameters=None,
-                 pyadjoint_parameters=None):
+                 win_amp_ratio=0., use_float32=False, compute_staltas=True,
+                 pyflex_parameters=None, pyadjoint_parameters=None):
         """
         Initiate the Config object either from scratch, or read from external.
 
@@ -72,6 +72,15 @@ class Config:
             - 'syn': as syntheitcs, which skips instrument response removal
                 and data gathering is based on simpler synthetic dir. structure
             Defaults to 'syn'
+        :type use_float32: bool
+        :param use_float32: cast waveform data to single precision after
+            preprocessing, halving the memory footprint of windowing and misfit
+            quantification. Defaults to False, i.e., keep double precision
+        :type compute_staltas: bool
+        :param compute_staltas: calculate synthetic STA/LTA waveforms when
+            using fixed windows. These are only used for plotting, so headless
+            workflows can set this False to skip the extra envelope and
+            STA/LTA calculations. Defaults to True
         :type observed_tag: str
         :param observed_tag: Tag to use for asdf dataset to label and search
             for obspy streams of observation data. Defaults 'observed'
@@ -110,6 +119,8 @@ class Config:
         self.st_obs_type = st_obs_type
         self.st_syn_type = st_syn_type
         self.win_amp_ratio = win_amp_ratio
+        self.use_float32 = use_float32
+        self.compute_staltas = compute_staltas
         self.component_list = component_list
 
         # To be filled in by reading or with default parameters
@@ -156,7 +167,8 @@ class Config:
         # Format the remainder of the keys identically
         key_dict = {"Process": ["min_period", "max_period",  "unit_output",
                                 "rotate_to_rtz", "win_amp_ratio", "st_obs_type",
-                                "st_syn_type"],
+                                "st_syn_type", "use_float32",
+                                "compute_staltas"],
                     "Labels": ["component_list", "observed_tag",
                                "synthetic_tag"],
                     "External": ["adj_src_type", "pyflex_config",
@@ -326,6 +338,25 @@ class Config:
         """
         return deepcopy(self)
 
+    def __copy__(self):
+        """
+        Lightweight clone of the Config, used when only top-level attributes
+        (e.g., event_id) need to differ between copies.
+
+        .. note::
+            The Pyflex and Pyadjoint Config objects are shared by reference
+            with the original, use Config.copy() if these need to be modified
+
+        :rtype: pyatoa.core.config.Config
+        :return: a shallow copy with its own component list
+        """
+        cfg = self.__class__.__new__(self.__class__)
+        cfg.__dict__.update(self.__dict__)
+        if self.component_list is not None:
+            cfg.component_list = list(self.component_list)
+
+        return cfg
+
     def write(self, write_to, fmt=None):
         """
         Wrapper for underlying low-level write functions
@@ -397,8 +428,10 @@ class Config:
         :type ds: pyasdf.asdf_data_set.ASDFDataSet
         :param ds: dataset to save the config file to
         """
-        # Deep copy to ensure that we aren't editing the Config parameters
-        attrs = vars(deepcopy(self))
+        # Copy the top level so that we aren't editing the Config parameters.
+        # Nested dictionaries and Configs are only read to build new ones, so
+        # they do not need to be deep copied
+        attrs = dict(vars(self))
 
         add_attrs = {}
         del_attrs = []
@@ -21,10 +21,13 @@ import os
 import time
 import logging
 import random
-from concurrent.futures import ProcessPoolExecutor
+from copy import copy
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from logging.handlers import MemoryHandler
 from pyasdf import ASDFDataSet
 from pyatoa import Manager
+from pyatoa.utils.form import format_iter, format_step
 
 
 class Executive:
@@ -36,7 +39,8 @@ class Executive:
     def __init__(self, event_ids, station_codes, config, max_stations=4,
                  max_events=1, cat="+", log_level="DEBUG", cwd=None,
                  datasets=None, figures=None, logs=None, adjsrcs=None,
-                 ds_fid_template=None):
+                 ds_fid_template=None, compression=None, fix_windows=False,
+                 write_adjsrcs=True):
         """
         The Executor needs some key information before it can run processing
 
@@ -76,6 +80,24 @@ class Executive:
         :param adjsrcs: path to save text adjoint source text files.
             defaults to a subdirectory 'adjsrcs', inside the current working
             directory.
+        :type compression: str or None
+        :param compression: HDF5 compression applied to data written to the
+            ASDFDataSets, passed to pyasdf, e.g., 'gzip-3'. Defaults to None
+            (no compression), as compressed, chunked data must be decoded
+            and copied on every read and encoded on every write. Datasets
+            that were created compressed can be converted once with
+            `h5repack -f NONE in.h5 out.h5`
+        :type fix_windows: bool
+        :param fix_windows: re-use misfit windows from the previous evaluation
+            stored in each dataset, rather than selecting new windows. Ignored
+            for the first evaluation (i01s00) where no windows exist yet
+        :type write_adjsrcs: bool
+        :param write_adjsrcs: write each station's adjoint sources to
+            SPECFEM ascii files in `adjsrcs` as stations are processed.
+            Adjoint sources are always stored in the event datasets, so on
+            filesystems where creating many small files is slow, this can be
+            set False and the ascii files written once they are needed with
+            `pyatoa.utils.write.write_adj_src_to_ascii`
         """
         self.config = config
 
@@ -96,12 +118,20 @@ class Executive:
         self.ds_fid_template = ds_fid_template or os.path.join(self.datasets,
                                                                "{event_id}.h5")
 
-        for path in [self.datasets, self.figures, self.logs]:
-            if not os.path.exists(path):
-                os.mkdir(path)
+        # Output directories are created once here so that stations only ever
+        # join filenames onto them
+        for path in [self.datasets, self.figures, self.logs, self.adjsrcs]:
+            os.makedirs(path, exist_ok=True)
 
         self.cat = cat
         self.log_level = log_level
+        self.compression = compression
+        self.write_adjsrcs = write_adjsrcs
+        # Criteria do not change between stations so only evaluate once
+        self.fix_windows = self._check_fix_window_criteria(
+            fix_windows, iteration=config.iteration,
+            step_count=config.step_count
+        )
 
         self.check()
 
@@ -139,18 +169,32 @@ class Executive:
             assert(len(sta.split(".")) == 4), (f"station codes must be in " 
                                                f"format: NN.SSS.LL.CCC")
 
+        # Position of each station in the sorted list, precomputed so that
+        # stations do not need to rebuild and search all codes to find it
+        self._station_index = {}
+        for i, sta in enumerate(self.station_codes):
+            self._station_index.setdefault(sta, i)
+
     def process(self):
         """
         Process all events concurrently
         """
         event_misfits = {}
-        with ProcessPoolExecutor(max_workers=self.max_events) as executor:
-            for event_id, station_misfits in zip(
-                    self.event_ids, executor.map(self.process_event,
-                                                 self.event_ids)):
-                event_misfits[event_id] = station_misfits
-
-        return event_misfits
+        # Event workers are not daemonic (unlike multiprocessing.Pool's), so
+        # they can start their own pools of station workers
+        with ProcessPoolExecutor(max_workers=self.max_events,
+                                 initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            futures = {executor.submit(_process_event_in_worker, event_id):
+                       event_id for event_id in self.event_ids}
+            # Collect events as they finish so one slow event does not hold
+            # up the bookkeeping of the others
+            for future in as_completed(futures):
+                event_misfits[futures[future]] = future.result()
+
+        # Return in the same order as the input event ids
+        return {event_id: event_misfits[event_id]
+                for event_id in self.event_ids}
 
     def process_event(self, event_id):
         """
@@ -160,97 +204,214 @@ class Executive:
         :param event_id: one value from the Executor.events list specifying
             a given event to process
         """
-        station_misfits = {}
+        misfits = {}
 
         # Subset internal code list by event id
-        codes = [code for code in self.codes if event_id in code]
-        with ProcessPoolExecutor(max_workers=self.max_stations) as executor:
-            for code, misfit in zip(codes, executor.map(self.process_station,
-                                                        codes)):
-                # Tag dictionary entries by station code
-                station_misfits[code.split(self.cat)[1]] = misfit
+        codes = self._event_codes(event_id)
+        # Each worker receives one copy of the Executive when it starts, rather
+        # than a pickled bound method (including all codes) for every station
+        with ProcessPoolExecutor(max_workers=self.max_stations,
+                                 initializer=_init_worker,
+                                 initargs=(self,)) as executor:
+            futures = {executor.submit(_process_station_in_worker, code): code
+                       for code in codes}
+            # Stations are processed concurrently, while their results are
+            # written to the event dataset one at a time as they finish
+            for future in as_completed(futures):
+                code = futures[future]
+                mgmt = future.result()
+                if mgmt is None:
+                    misfits[code] = None
+                    continue
+                self._write_station(code, mgmt)
+                misfits[code] = mgmt.stats.misfit
+
+        # Tag dictionary entries by station code, in the order of the codes
+        station_misfits = {code.split(self.cat)[1]: misfits[code]
+                           for code in codes}
 
         return station_misfits
 
     def process_station(self, event_id_and_station_code):
+        """
+        Process and then write the results for a single source receiver pair
+
+        .. note::
+            Employs a workaround to inability to parallel write to HDF5 files
+            BlockingIOError by doing the processing first, and then waiting
+            for each process to finish writing before accessing.
+
+        :type event_id_and_station_code: str
+        :param event_id_and_station_code: a string concatenation of a given
+            event id and station code, which will be used to process a single
+            source receiver pair
+        :rtype: float or None
+        :return: misfit for the source receiver pair, None if no data loaded
+        """
+        mgmt = self._process_station(event_id_and_station_code)
+        if mgmt is None:
+            return None
+        self._write_station(event_id_and_station_code, mgmt)
+
+        return mgmt.stats.misfit
+
+    def _process_station(self, event_id_and_station_code):
         """
         Parallel process multiple Managers simultaneously, which is the biggest
-        time sync. IO is done in serial to get around BlockingIO
+        time sync. Writing to the dataset is left to the caller so that it can
+        be done in serial to get around BlockingIO
 
         .. note::
             Very broad exceptions to keep process running smoothly, you will
             need to check log messages individually to figure out if and where
             things did not work
 
-        .. note::
-            Employs a workaround to inability to parallel write to HDF5 files
-            BlockingIOError by doing the processing first, and then waiting
-            for each process to finish writing before accessing.
-
         :type event_id_and_station_code: str
         :param event_id_and_station_code: a string concatenation of a given
             event id and station code, which will be used to process a single
             source receiver pair
+        :rtype: pyatoa.core.manager.Manager or None
+        :return: the Manager after processing, None if no data could be loaded
         """
         # Using the event id and station code for indexing and tag information
         event_id, station_code = event_id_and_station_code.split(self.cat)
         net, sta, _, _ = station_code.split(".")
         filename = f"{event_id}_{net}_{sta}"
-        idx = self.codes.index(event_id_and_station_code)
-        rank = self._check_rank(event_id_and_station_code)
+        idx = (self.event_ids.index(event_id) * len(self.station_codes) +
+               self._station_index[station_code])
+        ncodes = len(self.event_ids) * len(self.station_codes)
+
+        print(f"processing {idx}/{ncodes}: {event_id} {station_code}")
+
+        log_path = os.path.join(self.logs, f"{filename}.txt")
+        with self._station_logger(log_path) as logger:
+            # Only the event id differs between stations, so a shallow copy
+            # that shares the Pyflex and Pyadjoint configs is sufficient
+            config = copy(self.config)
+            config.event_id = event_id
+
+            # Default dataset name needs to be formatted, but user-defined
+            # filenames may not, and will not be affected by format()
+            ds_fid = self.ds_fid_template.format(event_id=event_id)
+
+            mgmt = Manager(config=config)
+            # Data gathering break will not allow further processing. Data are
+            # expected to have been gathered into the event dataset beforehand
+            try:
+                with self._open_dataset(ds_fid, mode="r") as ds:
+                    mgmt.load(code=f"{net}.{sta}", ds=ds, config=False)
+                mgmt.ds = None
+            except Exception as e:
+                logger.warning(e)
+                return None
+            # Processing break will allow writing waveforms and plotting
+            try:
+                if self.fix_windows:
+                    # Windows from the previous evaluation are read from the
+                    # dataset, relative to the Config iteration and step count
+                    with self._open_dataset(ds_fid, mode="r") as ds:
+                        mgmt.ds = ds
+                        try:
+                            mgmt.standardize().preprocess()
+                            mgmt.window(fix_windows=True).measure()
+                        finally:
+                            mgmt.ds = None
+                else:
+                    mgmt.flow()
+                if self.write_adjsrcs:
+                    mgmt.write_adjsrcs(path=self.adjsrcs, write_blanks=True)
+            except Exception as e:
+                logger.warning(e)
+                pass
+            # Plotting break will allow writing waveforms. Stations that were
+            # never standardized would only produce an error, so skip them
+            # before paying for the plotting imports
+            if not mgmt.stats.standardized:
+                logger.info("skipping plot, waveforms not standardized")
+                return mgmt
+            try:
+                mgmt.plot(choice="both", show=False,
+                          save=os.path.join(self.figures, f"{filename}.png")
+                          )
+            except Exception as e:
+                logger.warning(e)
+                pass
 
-        print(f"processing {idx}/{len(self.codes)}: {event_id} {station_code}")
+        return mgmt
 
-        logger, memhandler = self._generate_logger(
-            os.path.join(self.logs, f"{filename}.txt")
-        )
+    def _write_station(self, event_id_and_station_code, mgmt):
+        """
+        Write the results of a processed Manager to the event dataset. The
+        first station of each event also writes the Config.
 
-        config = self.config.copy()
-        config.event_id = event_id
+        :type event_id_and_station_code: str
+        :param event_id_and_station_code: a string concatenation of a given
+            event id and station code, which will be used to process a single
+            source receiver pair
+        :type mgmt: pyatoa.core.manager.Manager
+        :param mgmt: Manager returned by Executive._process_station()
+        """
+        event_id, _ = event_id_and_station_code.split(self.cat)
+        ds_fid = self.ds_fid_template.format(event_id=event_id)
+        rank = self._check_rank(event_id_and_station_code)
 
-        mgmt = Manager(config=config)
-        # Data gathering break will not allow further processing
-        try:
-            mgmt.gather(code=station_code, syn_dir_template=event_id)
-        except Exception as e:
-            logger.warning(e)
-            return None
-        # Processing break will allow writing waveforms and plotting
-        try:
-            mgmt.flow()
-            mgmt.write_adjsrcs(path=self.paths.adjsrcs, write_blanks=True)
-        except Exception as e:
-            logger.warning(e)
-            pass
-        # Plotting break will allow writing waveforms
-        try:
-            mgmt.plot(choice="both", show=False,
-                      save=os.path.join(self.figures, f"{filename}.png")
-                      )
-        except Exception as e:
-            logger.warning(e)
-            pass
-
-        # Wait till the very end to write to the HDF5 file, then do it serially
-        # as it should be quick
+        with self._open_dataset(ds_fid) as ds:
+            mgmt.write_to_dataset(ds=ds)
+            if rank == 0:
+                mgmt.config.write(ds)
+
+    def _open_dataset(self, ds_fid, mode="a"):
+        """
+        Workaround for the inability to access HDF5 files from multiple
+        processes at once. Keep trying to open the dataset until it is no
+        longer locked by another process.
+
+        .. note::
+            PyASDF creates the underlying h5py.File itself and does not take
+            HDF5 file access properties, so options such as page buffering
+            cannot be set here. Page buffering also only applies to files
+            created with the 'page' file space strategy, which is decided by
+            whoever creates the dataset, e.g., with
+            `h5py.File(fid, "w", fs_strategy="page")` before PyASDF opens it
+
+        :type ds_fid: str
+        :param ds_fid: filename of the ASDFDataSet to open
+        :type mode: str
+        :param mode: mode to open the dataset in, defaults to 'a' (append)
+        :rtype: pyasdf.ASDFDataSet
+        :return: the opened dataset
+        """
         while True:
             try:
-                # Default dataset name needs to be formatted, but user-defined
-                # filenames may not, and will not be affected by format()
-                ds_fid = self.ds_fid_template.format(event_id=event_id)
-                with ASDFDataSet(ds_fid) as ds:
-                    mgmt.ds = ds
-                    mgmt.write()
-                    if rank == 0:
-                        config.write(ds)
-                    break
+                return ASDFDataSet(ds_fid, mode=mode,
+                                   compression=self.compression)
             except BlockingIOError:
                 # Random sleep time to decrease chances of two processes
                 # attempting to access at exactly the same time
                 time.sleep(random.random())
 
-        memhandler.flush()
-        return mgmt.stats.misfit
+    @staticmethod
+    def _check_fix_window_criteria(fix_windows, iteration, step_count):
+        """
+        Determine whether windows can be fixed for a given evaluation. Windows
+        can only be retrieved if they were selected in a previous evaluation,
+        so the first evaluation of the inversion always selects new windows.
+
+        :type fix_windows: bool
+        :param fix_windows: whether the User has requested fixed windows
+        :type iteration: int or str
+        :param iteration: current iteration, e.g. 1 or 'i01'
+        :type step_count: int or str
+        :param step_count: current step count, e.g. 0 or 's00'
+        :rtype: bool
+        :return: True if windows should be retrieved rather than selected
+        """
+        if not fix_windows:
+            return False
+        if iteration is None or step_count is None:
+            return False
+        return (format_iter(iteration), format_step(step_count)) != \
+            ("i01", "s00")
 
     def _check_rank(self, event_id_and_station_code):
         """
@@ -265,25 +426,40 @@ class Executive:
         :rtype: int
         :return: rank index in Executive.codes based on event and station
         """
-        event_id, station_code = event_id_and_station_code.split(self.cat)
-        event_codes = sorted([code for code in self.codes if event_id in code])
-        return event_codes.index(event_id_and_station_code)
+        _, station_code = event_id_and_station_code.split(self.cat)
+        return self._station_index[station_code]
 
-    def _generate_logger(self, log_path):
+    def _event_codes(self, event_id):
         """
-        Create a log file for each source. No stream handler, only file output
-        Also create a memory handler to dump all log messages at once, rather
-        than as they happen, allowing multiple stations to write to the same
-        file sequentially
+        The subset of Executive.codes that belong to a single event, in order
+
+        :type event_id: str
+        :param event_id: event id to return codes for
+        :rtype: list of str
+        :return: event-station codes for the given event
+        """
+        return [f"{event_id}{self.cat}{sta}" for sta in self.station_codes]
+
+    @contextmanager
+    def _station_logger(self, log_path):
+        """
+        Redirect the Pyflex, Pyadjoint and Pyatoa loggers to a log file for a
+        single source receiver pair. No stream handler, only file output.
+        On exit the file handler is detached and closed and the original
+        handlers are restored, so that handlers and open files do not
+        accumulate as more stations are processed by the same worker.
+
+        Records are buffered in memory and written to the log file in one go
+        when the station is finished (or on a critical message), rather than
+        being written and flushed line by line, which is slow on shared
+        filesystems.
 
         :type log_path: str
         :param log_path: path and filename to save log file
+        :rtype: logging.Logger
+        :return: the Pyatoa logger, which now writes to the log file
         """
         filehandler = logging.FileHandler(log_path, mode="w")
-        memhandler = MemoryHandler(capacity=1024 * 100,
-                                   flushLevel=self.log_level,
-                                   target=filehandler
-                                   )
 
         # Maintain the same look as the standard console log messages
         logfmt = "[%(asctime)s] - %(name)s - %(levelname)s: %(message)s"
@@ -291,15 +467,75 @@ class Executive:
         filehandler.setFormatter(formatter)
         filehandler.setLevel(self.log_level)
 
+        memhandler = MemoryHandler(capacity=10000, flushLevel=logging.CRITICAL,
+                                   target=filehandler)
+        memhandler.setLevel(self.log_level)
+
+        loggers = {}
         for log in ["pyflex", "pyadjoint", "pyatoa"]:
-            # Set the overall log level
             logger = logging.getLogger(log)
+            loggers[logger] = (logger.handlers[:], logger.level)
             # Turn off any existing handlers (stream and file for all packages)
-            while logger.hasHandlers():
-                logger.removeHandler(logger.handlers[0])
+            for handler in logger.handlers[:]:
+                logger.removeHandler(handler)
 
             logger.setLevel(self.log_level)
-            logger.addHandler(filehandler)
-            # logger.addHandler(memhandler)
+            logger.addHandler(memhandler)
 
-        return logger, memhandler
\ No newline at end of file
+        try:
+            yield logger
+        finally:
+            for logger, (handlers, level) in loggers.items():
+                logger.removeHandler(memhandler)
+                for handler in handlers:
+                    logger.addHandler(handler)
+                logger.setLevel(level)
+            # Closing the memory handler flushes the buffered records
+            memhandler.close()
+            filehandler.close()
+
+
+# Executive held by each worker process, set by _init_worker
+_EXECUTIVE = None
+
+
+def _init_worker(executive):
+    """
+    Initializer for event and station worker processes. Stores the Executive
+    once per worker so that tasks only need to send an event id or station
+    code. Workers only ever save figures to disk, so the non-interactive Agg
+    backend avoids any GUI overhead
+
+    :type executive: pyatoa.core.executive.Executive
+    :param executive: the Executive that is processing events and stations
+    """
+    global _EXECUTIVE
+    _EXECUTIVE = executive
+
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def _process_event_in_worker(event_id):
+    """
+    Process all stations for a single event with the worker's Executive
+
+    :type event_id: str
+    :param event_id: event id to process
+    :rtype: dict
+    :return: station misfits for the event, keyed by station code
+    """
+    return _EXECUTIVE.process_event(event_id)
+
+
+def _process_station_in_worker(event_id_and_station_code):
+    """
+    Process a single source receiver pair with the worker's Executive
+
+    :type event_id_and_station_code: str
+    :param event_id_and_station_code: a string concatenation of a given
+        event id and station code
+    :rtype: pyatoa.core.manager.Manager or None
+    :return: the Manager after processing, None if no data could be loaded
+    """
+    return _EXECUTIVE._process_station(event_id_and_station_code)
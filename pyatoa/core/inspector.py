@@ -8,10 +8,9 @@ import pyasdf
 import traceback
 import numpy as np
 import pandas as pd
-from glob import glob
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
 from fnmatch import filter as fnf
-from obspy.geodetics import gps2dist_azimuth
 from pyatoa import logger
 from pyatoa.utils.form import format_event_name
 from pyatoa.visuals.insp_plot import InspectorPlotter
@@ -149,9 +148,7 @@ class Inspector(InspectorPlotter):
     def steps(self):
         """Returns a pandas. Series of iteration with values listing steps"""
         try:
-            return self.windows.groupby("iteration").apply(
-                lambda x: x["step"].unique()
-            )
+            return self.windows.groupby("iteration").step.unique()
         except KeyError:
             return []
     
@@ -217,7 +214,7 @@ class Inspector(InspectorPlotter):
     def evaluations(self):
         """Returns the number of iterations, or the sum of all step counts"""
         try:
-            return sum(self.steps.apply(len).values)
+            return sum(self.steps.map(len).values)
         except AttributeError:
             return 0
 
@@ -242,33 +239,36 @@ class Inspector(InspectorPlotter):
         latitude and longitude values for both, and event information including
         magnitude, origin time, id, etc.
 
-        Returns Dataframes for sources and receivers iff they are not already
-        contained in the class dataframes, to avoid duplicates.
-
-        Returns empty DataFrames if no unique info was found.
+        Sources and receivers are only added to the class dataframes if they
+        are not already contained, to avoid duplicates.
 
         :type ds: pyasdf.ASDFDataSet
         :param ds: dataset to query for distances
-        :rtype source: pandas.core.frame.DataFrame
-        :return source: single row Dataframe containing event info from dataset
-        :rtype receivers: multiindexed dataframe containing unique station info
+        :rtype: str
+        :return: event id of the dataset, so that it does not need to be parsed
+            again when reading windows
         """
+        # Events are parsed from QuakeML every time they are accessed from the
+        # dataset, so only do it once
+        event = ds.events[0]
+
         # Create a dataframe with source information, ignore duplicates
-        event_id = format_event_name(ds.events[0])
+        event_id = format_event_name(event)
         # Some events, like FORCESOLUTIONS, do not contain information on magni.
         try:
-            magnitude = ds.events[0].preferred_magnitude().mag
+            magnitude = event.preferred_magnitude().mag
         except AttributeError:
             magnitude = None
 
         if event_id not in self.sources.index:
+            origin = event.preferred_origin()
             src = {
-                "event_id": format_event_name(ds.events[0]),
-                "time": str(ds.events[0].preferred_origin().time),
+                "event_id": event_id,
+                "time": str(origin.time),
                 "magnitude": magnitude,
-                "depth_km": ds.events[0].preferred_origin().depth * 1E-3,
-                "latitude": ds.events[0].preferred_origin().latitude,
-                "longitude": ds.events[0].preferred_origin().longitude,
+                "depth_km": origin.depth * 1E-3,
+                "latitude": origin.latitude,
+                "longitude": origin.longitude,
                 }
             source = pd.DataFrame([list(src.values())],
                                   columns=list(src.keys())
@@ -300,7 +300,9 @@ class Inspector(InspectorPlotter):
                                      )
             self.receivers = pd.concat([self.receivers, receivers.T])
 
-    def _get_windows_from_dataset(self, ds):
+        return event_id
+
+    def _get_windows_from_dataset(self, ds, eid):
         """
         Get window and misfit information from dataset auxiliary data
         Model and Step information should match between the two
@@ -311,11 +313,11 @@ class Inspector(InspectorPlotter):
 
         :type ds: pyasdf.ASDFDataSet
         :param ds: dataset to query for misfit:
+        :type eid: str
+        :param eid: event id of the dataset
         :rtype: pandas.DataFrame
         :return: a dataframe object containing information per misfit window
         """
-        eid = format_event_name(ds.events[0])
-
         # Initialize an empty dictionary that will be used to initalize
         # a Pandas DataFrame
         window = {"event": [], "iteration": [], "step": [], "network": [],
@@ -360,26 +362,29 @@ class Inspector(InspectorPlotter):
                 misfit_window_eval = misfit_window_eval[step]
                 adjoint_source_eval = adjoint_source_eval[step]
 
+            # Adjoint sources are listed once per evaluation, and each one is
+            # only read once, as all windows of a component share its misfit
+            adj_tags = adjoint_source_eval.list()
+            adj_misfits = {}
             for win in misfit_window_eval:
                 # pick apart information from this window
                 cha_id = win.parameters["channel_id"]
                 net, sta, loc, cha = cha_id.split(".")
                 component = cha[-1]
 
-                try:
-                    # Workaround for potential mismatch between channel
-                    # names of windows and adjsrcs, search for w/ wildcard
-                    adj_tag = fnf(adjoint_source_eval.list(),
-                                  f"{net}_{sta}_*{component}"
-                                  )[0]
-
-                    # This misfit value will be the same for mult windows
-                    window["misfit"].append(adjoint_source_eval[
-                                                adj_tag].parameters["misfit"])
-                except IndexError:
-                    if self.verbose:
-                        print(f"No matching adjoint source for {cha_id}")
-                    window["misfit"].append(np.nan)
+                # Workaround for potential mismatch between channel
+                # names of windows and adjsrcs, search for w/ wildcard
+                adj_pattern = f"{net}_{sta}_*{component}"
+                if adj_pattern not in adj_misfits:
+                    try:
+                        adj_tag = fnf(adj_tags, adj_pattern)[0]
+                        adj_misfits[adj_pattern] = adjoint_source_eval[
+                                                adj_tag].parameters["misfit"]
+                    except IndexError:
+                        if self.verbose:
+                            print(f"No matching adjoint source for {cha_id}")
+                        adj_misfits[adj_pattern] = np.nan
+                window["misfit"].append(adj_misfits[adj_pattern])
 
                 # winfo keys match the keys of the Pyflex Window objects
                 for par in winfo:
@@ -436,38 +441,108 @@ class Inspector(InspectorPlotter):
                              "must also set the variable: 'iteration'")
         return iteration, step_count
     
-    def discover(self, path="./", ignore_symlinks=True):
+    def discover(self, path="./", ignore_symlinks=True, max_workers=None):
         """
         Allow the Inspector to scour through a path and find relevant files,
         appending them to the internal structure as necessary.
 
+        .. note::
+            Datasets are read one by one in the current process by default.
+            If `max_workers` > 1, they are instead read concurrently by a pool
+            of worker processes (not threads), and then collected into the
+            Inspector in the order they were found. Scripts using worker
+            processes on spawn-start platforms (macOS, Windows) need an
+            `if __name__ == "__main__":` guard.
+
         :type path: str
         :param path: path to the pyasdf.asdf_data_set.ASDFDataSets that were
             outputted by the Seisflows workflow
         :type ignore_symlinks: bool
         :param ignore_symlinks: skip over symlinked HDF5 files when discovering
+        :type max_workers: int
+        :param max_workers: maximum number of processes used to read datasets.
+            If None or 1 (default None), datasets are read one by one in the
+            current process. No more processes are started than there are
+            datasets to read
         """
-        dsfids = glob(os.path.join(path, "*.h5"))
-        # remove symlinks from the list if requested
-        if ignore_symlinks:
-            dsfids = [_ for _ in dsfids if not os.path.islink(_)]
-        for i, dsfid in enumerate(dsfids):
-            if self.verbose:
-                print(f"{os.path.basename(dsfid):<25} "
-                      f"{i+1:0>3}/{len(dsfids):0>3}",  end="..."
-                      )
-            try:
-                self.append(dsfid)
-                if self.verbose:
-                    print("done")
-            except KeyError as e:
+        # Single pass over the directory, DirEntry carries symlink information
+        # so no additional stat calls are required to filter out symlinks
+        with os.scandir(path) as entries:
+            dsfids = [os.path.join(path, entry.name) for entry in entries
+                      if entry.name.endswith(".h5") and
+                      not entry.name.startswith(".") and
+                      not (ignore_symlinks and entry.is_symlink())]
+        if not dsfids:
+            return self
+
+        def collect(read):
+            """Gather the dataframes of each dataset in discovery order"""
+            results = []
+            for i, (dsfid, result) in enumerate(zip(dsfids, read)):
                 if self.verbose:
-                    print(f"error: {e}")
-                    traceback.print_exc()
-                continue
+                    print(f"{os.path.basename(dsfid):<25} "
+                          f"{i+1:0>3}/{len(dsfids):0>3}...",
+                          "done" if result is not None else "error")
+                if result is not None:
+                    results.append(result)
+            return results
+
+        # Each dataset is read into its own dataframes, which are collected
+        # and merged once at the end, rather than growing the Inspector's
+        # dataframes (and copying them) once for every dataset
+        verbose = [self.verbose] * len(dsfids)
+        max_workers = min(max_workers or 1, len(dsfids))
+        if max_workers == 1:
+            results = collect(map(_read_dataset, dsfids, verbose))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                results = collect(executor.map(_read_dataset, dsfids, verbose))
+
+        if results:
+            self._merge(*zip(*results))
 
         return self
 
+    def _merge(self, sources, receivers, windows):
+        """
+        Merge dataframes read from individual datasets into the Inspector,
+        in order, ignoring sources and receivers that are already present, as
+        well as any evaluations that have already been collected for a given
+        event. Each dataframe type is concatenated only once.
+
+        :type sources: list of pandas.DataFrame
+        :param sources: source information indexed by event id
+        :type receivers: list of pandas.DataFrame
+        :param receivers: receiver information indexed by network and station
+        :type windows: list of pandas.DataFrame
+        :param windows: misfit window information
+        """
+        for attr, dfs in [("sources", sources), ("receivers", receivers)]:
+            dfs = [df for df in [getattr(self, attr), *dfs] if not df.empty]
+            if dfs:
+                df = pd.concat(dfs)
+                setattr(self, attr, df[~df.index.duplicated(keep="first")])
+
+        # Evaluations are identified by event, iteration and step, and only
+        # the first collection of windows for each evaluation is kept
+        evals = ["event", "iteration", "step"]
+        dfs, collected = [], None
+        for df in [self.windows, *windows]:
+            if df.empty:
+                continue
+            idx = pd.MultiIndex.from_frame(df[evals])
+            if collected is not None:
+                new = ~idx.isin(collected)
+                df, idx = df[new], idx[new]
+                collected = collected.append(idx)
+            else:
+                collected = idx
+            dfs.append(df)
+        if dfs:
+            self.windows = pd.concat(dfs, ignore_index=True)
+
+        self._clear_cache()
+
     def append(self, dsfid, srcrcv=True, windows=True):
         """
         Simple function to parse information from a
@@ -482,16 +557,23 @@ class Inspector(InspectorPlotter):
         :param windows: gather window information
         """
         try:
-            with pyasdf.ASDFDataSet(dsfid) as ds:
+            # Read-only access takes a shared file lock, so datasets can be
+            # read by multiple processes at once, and nothing is written back
+            with pyasdf.ASDFDataSet(dsfid, mode="r") as ds:
+                # The event is parsed from QuakeML at most once per dataset
+                event_id = None
                 if srcrcv:
-                    self._get_srcrcv_from_dataset(ds)
+                    event_id = self._get_srcrcv_from_dataset(ds)
                 if windows:
+                    if event_id is None:
+                        event_id = format_event_name(ds.events[0])
                     try:
-                        self._get_windows_from_dataset(ds)
+                        self._get_windows_from_dataset(ds, event_id)
                     except AttributeError as e:
                         if self.verbose:
                             print("error reading dataset: "
                                   "missing auxiliary data")
+                self._clear_cache()
                 return
         except OSError:
             if self.verbose:
@@ -542,18 +624,19 @@ class Inspector(InspectorPlotter):
 
             self.windows = pd.concat([self.windows, windows_ext])
 
-        # Redo get models since iterations have changed
-        if self._models is not None:
-            self.get_models()
+        # Models and misfits are re-calculated since iterations have changed
+        self._clear_cache()
 
         return self
 
     def save(self, path="./", fmt="csv", tag=None):
         """
-        Save the downloaded attributes into JSON files for easier re-loading.
+        Save the downloaded attributes to disk for easier re-loading.
 
         .. note::
-            fmt == 'hdf' requires 'pytables' to be installed in the environment
+            fmt == 'hdf' requires 'pytables' to be installed in the environment,
+            and writes a single compressed binary file which is smaller and
+            faster to read back than the text files written by fmt == 'csv'
 
         :type tag: str
         :param tag: tag to use to save files, defaults to the class tag
@@ -567,7 +650,7 @@ class Inspector(InspectorPlotter):
             tag = self.tag
         if fmt == "hdf":
             try:
-                import pytables
+                import tables  # PyTables is imported as 'tables'
             except ImportError:
                 fmt = "csv"
                 print("format 'hdf' requires pytables, defaulting to 'csv'")
@@ -587,7 +670,10 @@ class Inspector(InspectorPlotter):
             if write_check == 0:
                 logger.warning("Inspector empty, will not write to disk")
         elif fmt == "hdf":
-            with pd.HDFStore(os.path.join(path, f"{tag}.hdf")) as s:
+            # Overwrite rather than append to any existing file, and compress
+            # as window dataframes are mostly repeated identifiers
+            with pd.HDFStore(os.path.join(path, f"{tag}.hdf"), mode="w",
+                             complevel=5, complib="blosc") as s:
                 s["sources"] = self.sources
                 s["receivers"] = self.receivers
                 s["windows"] = self.windows
@@ -639,6 +725,8 @@ class Inspector(InspectorPlotter):
         else:
             raise NotImplementedError
 
+        self._clear_cache()
+
     def copy(self):
         """
         Return a deep copy of the Inspector
@@ -652,6 +740,19 @@ class Inspector(InspectorPlotter):
         self.windows = pd.DataFrame()
         self.sources = pd.DataFrame()
         self.receivers = pd.DataFrame()
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """
+        Wipe out the internally stored models, misfits and source-receiver
+        information so that they are re-calculated from the current dataframes
+        the next time they are requested. Called whenever data is added.
+        """
+        self._models = None
+        self._srcrcv = None
+        self._step_misfit = None
+        self._event_misfit = None
+        self._station_misfit = None
 
     def isolate(self, iteration=None, step_count=None,  event=None,
                 network=None, station=None, channel=None, component=None,
@@ -753,7 +854,7 @@ class Inspector(InspectorPlotter):
         windows.sort_values(group_list, inplace=True)
 
         group = windows.groupby(group_list[:-1]).length_s
-        df = pd.concat([group.apply(len).rename("nwin"), group.sum()],
+        df = pd.concat([group.size().rename("nwin"), group.sum()],
                         axis=1)
         if level == "step":
             return df
@@ -799,7 +900,7 @@ class Inspector(InspectorPlotter):
 
         # Count the number of windows on a per station basis
         nwin = misfits.groupby(
-                group_list[:-1]).misfit.apply(len).rename("nwin")
+                group_list[:-1]).misfit.size().rename("nwin")
 
         # Misfit is unique per component, not window, drop repeat components
         misfits.drop_duplicates(subset=group_list[:-1], keep="first", 
@@ -814,26 +915,20 @@ class Inspector(InspectorPlotter):
         # No formal definition of station misfit so we just define it as the
         # misfit for a given station, divided by number of windows
         if level == "station":
-            df["misfit"] = df.apply(
-                lambda row: row.unscaled_misfit / row.nwin, axis=1
-            )
+            df["misfit"] = df.unscaled_misfit / df.nwin
         # Event misfit function defined by Tape et al. (2010) Eq. 6
         elif level in ["event", "step"]:
             # Group misfits to the event level and sum together windows, misfit
             df = df.groupby(group_list[:3]).sum() 
-            df["misfit"] = df.apply(
-                lambda row: row.unscaled_misfit / (2 * row.nwin), axis=1
-            )
+            df["misfit"] = df.unscaled_misfit / (2 * df.nwin)
             if level == "step":
                 # Sum the event misfits if step-wise misfit is requested
                 misfits = df.loc[:, "misfit"]
                 group = misfits.groupby(["iteration", "step"])
-                df = pd.concat([group.apply(len).rename("n_event"),
+                df = pd.concat([group.size().rename("n_event"),
                                 group.sum().rename("summed_misfit")], axis=1)
                 # Misfit function a la Tape et al. (2010) Eq. 7
-                df["misfit"] = df.apply(
-                    lambda row: row.summed_misfit / row.n_event, axis=1
-                )
+                df["misfit"] = df.summed_misfit / df.n_event
                 df.drop(labels="summed_misfit", axis=1)
         else:
             raise NotImplementedError(
@@ -1128,6 +1223,8 @@ class Inspector(InspectorPlotter):
             function evaluation.
         """
         misfit = self.misfit()
+        # Steps are grouped from the windows on each access, so do that once
+        steps = self.steps
         models = {"model": [], "iteration": [], "step_count": [], "misfit": [],
                   "status": [], "state": []
                   }
@@ -1136,11 +1233,11 @@ class Inspector(InspectorPlotter):
         for m, iter_ in enumerate(self.iterations):
             # First we collect misfit values for each step for reference
             misfits_ = [float(misfit.loc[iter_].loc[_].misfit) for _ in
-                        self.steps[iter_]
+                        steps[iter_]
                         ]
 
             # Then we loop through the steps and pick out the smallest misfit
-            for s, step in enumerate(self.steps[iter_]):
+            for s, step in enumerate(steps[iter_]):
                 # Initial evaluation, accepted misfits
                 if step == "s00":
                     model = m
@@ -1177,28 +1274,28 @@ class Inspector(InspectorPlotter):
         if self.sources.empty or self.receivers.empty:
             return []
 
-        srcrcv_dict = {"event": [], "network": [], "station": [],
-                       "distance_km": [], "backazimuth": []
-                       }
-
-        for eid, elat, elon, edpth in zip(self.sources.index.to_numpy(),
-                                          self.sources.latitude.to_numpy(),
-                                          self.sources.longitude.to_numpy(),
-                                          self.sources.depth_km.to_numpy()
-                                          ):
-            for rid, rlat, rlon in zip(self.receivers.index,
-                                       self.receivers.latitude.to_numpy(),
-                                       self.receivers.longitude.to_numpy()
-                                       ):
-                gcd, _, baz = gps2dist_azimuth(lat1=elat, lon1=elon,
-                                               lat2=rlat, lon2=rlon,
-                                               )
-                net, sta = rid
-                srcrcv_dict["event"].append(eid)
-                srcrcv_dict["network"].append(net)
-                srcrcv_dict["station"].append(sta)
-                srcrcv_dict["distance_km"].append(gcd * 1E-3)
-                srcrcv_dict["backazimuth"].append(baz)
+        from pyproj import Geod
+
+        # Every source is paired with every receiver, and all distances and
+        # backazimuths are calculated at once on the same WGS84 ellipsoid
+        # used by ObsPy's gps2dist_azimuth()
+        nsrc, nrcv = len(self.sources), len(self.receivers)
+        _, baz, gcd = Geod(ellps="WGS84").inv(
+            np.repeat(self.sources.longitude.to_numpy(dtype=float), nrcv),
+            np.repeat(self.sources.latitude.to_numpy(dtype=float), nrcv),
+            np.tile(self.receivers.longitude.to_numpy(dtype=float), nsrc),
+            np.tile(self.receivers.latitude.to_numpy(dtype=float), nsrc)
+        )
+        srcrcv_dict = {
+            "event": np.repeat(self.sources.index.to_numpy(), nrcv),
+            "network": np.tile(
+                self.receivers.index.get_level_values(0).to_numpy(), nsrc),
+            "station": np.tile(
+                self.receivers.index.get_level_values(1).to_numpy(), nsrc),
+            "distance_km": gcd * 1E-3,
+            # Backazimuth is given in the range [0, 360) as by ObsPy
+            "backazimuth": baz % 360,
+        }
 
         self._srcrcv = pd.DataFrame(srcrcv_dict)
 
@@ -1222,3 +1319,32 @@ class Inspector(InspectorPlotter):
         models.reset_index(drop=True, inplace=True)
 
         return models
+
+
+def _read_dataset(dsfid, verbose=True):
+    """
+    Read source, receiver and window information from a single dataset into
+    an empty Inspector. Used by Inspector.discover() to read many datasets
+    in separate processes, as opening and reading each one is independent.
+
+    :type dsfid: str
+    :param dsfid: fid of the dataset
+    :type verbose: bool
+    :param verbose: print errors encountered while reading the dataset
+    :rtype: tuple of pandas.DataFrame or None
+    :return: (sources, receivers, windows) of the dataset, or None if the
+        dataset could not be read
+    """
+    # Bypass __init__ so that the worker does not look for saved Inspectors
+    insp = Inspector.__new__(Inspector)
+    insp.verbose = verbose
+    insp.reset()
+    try:
+        insp.append(dsfid)
+    except KeyError as e:
+        if verbose:
+            print(f"{os.path.basename(dsfid)} error: {e}")
+            traceback.print_exc()
+        return None
+
+    return insp.sources, insp.receivers, insp.windows
@@ -3,15 +3,16 @@
 A class to control workflow and temporarily store and manipulate data
 """
 import os
+import shutil
 import obspy
-import matplotlib as mpl
-import matplotlib.pyplot as plt
+import logging
 import numpy as np
 import pyflex
 import pyadjoint
 import warnings
 
-from copy import deepcopy
+from collections import OrderedDict
+from copy import copy, deepcopy
 from obspy.signal.filter import envelope
 from pyasdf import ASDFWarning
 
@@ -26,12 +27,44 @@ from pyatoa.utils.process import (apply_filter, trim_streams, zero_pad,
                                   match_npts, normalize, stf_convolve,
                                   is_preprocessed)
 from pyatoa.utils.srcrcv import gcd_and_baz
-from pyatoa.utils.window import reject_on_global_amplitude_ratio
+from pyatoa.utils.window import (reject_on_global_amplitude_ratio,
+                                 CachedWindowSelector)
 
 from pyatoa.scripts.load_example_data import load_example_data
 
-from pyatoa.visuals.wave_maker import WaveMaker
-from pyatoa.visuals.map_maker import MapMaker
+# Small least-recently-used cache of station data read from ASDFDataSets by
+# Manager.load(), so that repeatedly loading the same station (e.g. when
+# iterating on windowing parameters) does not re-read the HDF5 file. Kept
+# small as entries live for the life of the process, see Manager.clear_cache()
+_LOAD_CACHE = OrderedDict()
+_LOAD_CACHE_SIZE = 8
+
+
+def _dataset_cache_key(ds, *args):
+    """
+    Key for the load cache, based on the dataset filename, size and
+    modification time so that changes to the underlying file invalidate
+    cached entries. Returns None if the dataset is not backed by a file.
+    """
+    try:
+        fstat = os.stat(ds.filename)
+    except (AttributeError, TypeError, OSError):
+        return None
+
+    return (os.path.abspath(ds.filename), fstat.st_size, fstat.st_mtime_ns,
+            *args)
+
+
+def _add_to_load_cache(key, value):
+    """
+    Add an entry to the load cache, evicting the least recently used entry if
+    the cache is full
+    """
+    if key is None:
+        return
+    _LOAD_CACHE[key] = value
+    if len(_LOAD_CACHE) > _LOAD_CACHE_SIZE:
+        _LOAD_CACHE.popitem(last=False)
 
 
 class ManagerError(Exception):
@@ -46,8 +79,16 @@ class ManagerStats(dict):
     A simple dictionary that can get and set keys as attributes and has a 
     cleaner looking print statement, used for storing internal statistics
     in the Manager class
+
+    .. note::
+        The instance dictionary is the dictionary itself, so attribute access
+        is a plain C-level lookup rather than a call to Python-level
+        __getattr__/__setattr__ overrides, which matters as stats are read
+        and written throughout the workflow
     """
     def __init__(self):
+        super().__init__()
+        self.__dict__ = self
         self.dataset_id = None 
         self.event_id = None 
         self.inv_name = None 
@@ -61,14 +102,9 @@ class ManagerStats(dict):
         self.obs_processed = False
         self.syn_processed = False
 
-    def __setattr__(self, key, value):
-        self[key] = value
-
-    def __getattr__(self, key):
-        try:
-            return self[key]
-        except KeyError:
-            raise AttributeError(key)
+    def __reduce__(self):
+        """Re-instantiate on unpickling so that __dict__ is again the dict"""
+        return self.__class__, (), None, None, iter(self.items())
 
     def __str__(self):
         str_ = ""
@@ -166,6 +202,16 @@ class Manager:
         self.adjsrcs = adjsrcs
         self.rejwins = {}
 
+        # Per-component lookup of traces, invalidated whenever Manager resets
+        self._comp_index = {}
+        self._check_state = None
+        self._st = None
+
+        # Pyflex representations of the event and station, which are retained
+        # across resets for the event as it does not change between stations
+        self._pyflex_event = None
+        self._pyflex_station = None
+
         # Internal statistics to keep track of the workflow progress
         self.stats = ManagerStats()
 
@@ -200,9 +246,21 @@ class Manager:
     def st(self):
         """
         Simplified call to return all streams available, observed and synthetic
+
+        .. note::
+            The combined Stream shares Trace objects with `st_syn` and
+            `st_obs` and is cached until either of their traces change
         """
         if self.st_syn and self.st_obs:
-            return self.st_syn + self.st_obs
+            traces = self.st_syn.traces + self.st_obs.traces
+            if self._st is not None:
+                cached_traces, st = self._st
+                if len(cached_traces) == len(traces) and \
+                        all(a is b for a, b in zip(cached_traces, traces)):
+                    return st
+            st = obspy.Stream(traces=traces)
+            self._st = (tuple(traces), st)
+            return st
         elif self.st_syn:
             return self.st_syn
         elif self.st_obs:
@@ -210,13 +268,141 @@ class Manager:
         else:
             return None
 
+    def _build_component_index(self):
+        """
+        Map component names to their traces for the observed and synthetic
+        streams so that repeated lookups do not need to scan and copy the
+        Stream each time, as `Stream.select()` would.
+        """
+        self._comp_index = {}
+        for which, st in [("obs", self.st_obs), ("syn", self.st_syn)]:
+            if st is None:
+                continue
+            self._comp_index[which] = (
+                st, len(st), {tr.stats.component: tr for tr in st}
+            )
+
+    def _get_trace(self, which, comp):
+        """
+        Return a single trace from the observed or synthetic stream based on
+        component, using the internal component index. Index is rebuilt if the
+        underlying stream has been swapped out or modified (e.g., rotated).
+
+        :type which: str
+        :param which: 'obs' or 'syn' to choose the stream to look in
+        :type comp: str
+        :param comp: component to return, e.g. 'Z'
+        :rtype: obspy.core.trace.Trace
+        :return: trace matching the given component
+        :raises IndexError: if no trace matches the component, mimicking the
+            behavior of accessing an empty Stream returned by Stream.select()
+        """
+        st = {"obs": self.st_obs, "syn": self.st_syn}[which]
+        if st is None:
+            raise IndexError(f"no '{which}' stream to select from")
+
+        cached_st, cached_len, index = self._comp_index.get(which,
+                                                            (None, 0, {}))
+        tr = index.get(comp)
+        if cached_st is not st or cached_len != len(st) or tr is None or \
+                tr.stats.component != comp:
+            self._build_component_index()
+            tr = self._comp_index[which][2].get(comp)
+        if tr is None:
+            raise IndexError(f"no '{which}' trace for component {comp}")
+
+        return tr
+
+    def _get_check_state(self):
+        """
+        Cheap snapshot of everything that `check` derives stats from, used to
+        skip re-checking when nothing has changed since the last check.
+
+        :rtype: tuple
+        :return: (objects, values) where objects are compared by identity and
+            values are compared by equality
+        """
+        objects = (self.ds, self.event, self.inv, self.config, self.st_obs,
+                   self.st_syn, self.windows, self.adjsrcs)
+        # Processing stats change if Streams are processed in place
+        values = [tuple(self.stats.values())]
+        for st in [self.st_obs, self.st_syn]:
+            if st is not None:
+                values.append(
+                    (len(st), sum(len(tr.stats.get("processing", []))
+                                  for tr in st))
+                )
+        return objects, tuple(values)
+
+    def _get_pyflex_srcrcv(self, net, sta):
+        """
+        Convert the internal Event and Inventory into the lightweight Pyflex
+        Event and Station objects that the WindowSelector uses. Pyflex would
+        otherwise re-parse the Event and traverse the Inventory for every
+        component. Results are memoized, the event across stations.
+
+        Falls back to returning the original objects if they cannot be parsed,
+        so that Pyflex can raise its own errors.
+
+        :type net: str
+        :param net: network code of the observed data
+        :type sta: str
+        :param sta: station code of the observed data
+        :rtype: tuple
+        :return: (event, station) to pass to the Pyflex WindowSelector
+        """
+        event, station = self.event, self.inv
+
+        if event is not None:
+            if self._pyflex_event is None or \
+                    self._pyflex_event[0] is not self.event:
+                origin = event.preferred_origin() or \
+                    (event.origins[0] if event.origins else None)
+                try:
+                    pf_event = pyflex.Event(
+                        latitude=float(origin.latitude),
+                        longitude=float(origin.longitude),
+                        depth_in_m=float(origin.depth),
+                        origin_time=origin.time
+                    )
+                except (AttributeError, TypeError):
+                    pf_event = event
+                self._pyflex_event = (self.event, pf_event)
+            event = self._pyflex_event[1]
+
+        if station is not None:
+            if self._pyflex_station is None or \
+                    self._pyflex_station[0] is not self.inv or \
+                    self._pyflex_station[1] != (net, sta):
+                selected = self.inv.select(network=net, station=sta)
+                try:
+                    sta_ = selected[0][0]
+                    pf_station = pyflex.Station(
+                        latitude=float(sta_.latitude),
+                        longitude=float(sta_.longitude)
+                    )
+                except (IndexError, TypeError):
+                    pf_station = station
+                self._pyflex_station = (self.inv, (net, sta), pf_station)
+            station = self._pyflex_station[2]
+
+        return event, station
+
     def check(self):
         """
         (Re)check the stats of the workflow and data within the Manager.
 
         Rechecks conditions whenever called, incase something has gone awry
-        mid-workflow. Stats should only be set by this function.
+        mid-workflow. Stats should only be set by this function. If no
+        attributes have been changed since the last check, returns early.
         """
+        state = self._get_check_state()
+        if self._check_state is not None:
+            objects, values = self._check_state
+            if all(a is b for a, b in zip(objects, state[0])) and \
+                    values == state[1]:
+                return
+
         # Give dataset filename if available
         if self.stats.dataset_id is None and self.ds is not None:
             self.stats.dataset_id = os.path.basename(self.ds.filename)
@@ -261,9 +447,10 @@ class Manager:
 
         # Check standardization by comparing waveforms against the first
         if not self.stats.standardized and self.st_obs and self.st_syn:
-            for tr in self.st[1:]:
+            st = self.st
+            for tr in st[1:]:
                 for atr in ["sampling_rate", "npts", "starttime"]:
-                    if getattr(tr.stats, atr) != getattr(self.st[0].stats, atr):
+                    if getattr(tr.stats, atr) != getattr(st[0].stats, atr):
                         break
                 break
             else:
@@ -285,13 +472,25 @@ class Manager:
         if not self.stats.misfit and self.adjsrcs is not None:
             self.stats.misfit = sum([_.misfit for _ in self.adjsrcs.values()])
 
+        self._check_state = self._get_check_state()
+
     def reset(self):
         """
         Restart workflow by deleting all collected data in the Manager, but
         retain dataset, event, config, so a new station can be
         processed with the same configuration as the previous workflow.
+
+        .. note::
+            Per-station waveform buffers are released rather than re-used.
+            Standardization and preprocessing replace trace data arrays
+            (resampling, trimming, filtering), so pre-allocated buffers would
+            not survive a single workflow, and a reset itself costs ~10us.
+            Event-level state that is expensive to rebuild (Pyflex event,
+            loaded dataset objects) is cached and retained instead.
         """
+        pyflex_event = self._pyflex_event
         self.__init__(ds=self.ds, event=self.event, config=self.config)
+        self._pyflex_event = pyflex_event
 
     def write_to_dataset(self, ds=None, choice=None):
         """
@@ -331,12 +530,12 @@ class Manager:
             choice = ["event", "inv", "st_obs", "st_syn", "windows", "adjsrcs",
                       "config"]
 
-        if self.event and "event" in choice:
+        if self.event is not None and "event" in choice:
             try:
                 ds.add_quakeml(self.event)
             except ValueError:
                 logger.debug("Event already present, not added")
-        if self.inv and "inv" in choice:
+        if self.inv is not None and "inv" in choice:
             try:
                 ds.add_stationxml(self.inv)
             except TypeError:
@@ -415,20 +614,29 @@ class Manager:
                     set(self.adjsrcs.keys()))
             )
             if blank_comps:
-                # Deep copy so that zeroing data doesn't affect original data
-                blank_adj = deepcopy(adj)
-                blank_adj.adjoint_source *= 0
+                # Only the data are replaced, so a shallow copy leaves the
+                # original adjoint source untouched
+                blank_adj = copy(adj)
+                blank_adj.adjoint_source = np.zeros_like(adj.adjoint_source)
+                # Blank adjoint sources only differ by filename, so format the
+                # ascii once and copy that file for any remaining components
+                blank_fid = None
                 for comp in blank_comps:
                     new_adj_comp = f"{adj.component[:-1]}{comp}"
-                    fid = f"{adj.network}.{adj.station}.{new_adj_comp}.adj"
-                    blank_adj.write(filename=os.path.join(path, fid),
-                                    format="SPECFEM",
-                                    time_offset=self.stats.time_offset_sec
-                                    )
+                    fid = os.path.join(
+                        path, f"{adj.network}.{adj.station}.{new_adj_comp}.adj"
+                    )
+                    if blank_fid is None:
+                        blank_adj.write(filename=fid, format="SPECFEM",
+                                        time_offset=self.stats.time_offset_sec
+                                        )
+                        blank_fid = fid
+                    else:
+                        shutil.copyfile(blank_fid, fid)
 
     def load(self, code=None, path=None, ds=None, synthetic_tag=None,
              observed_tag=None, config=True, windows=False,
-             adjsrcs=False):
+             adjsrcs=False, cache=True):
         """
         Populate the manager using a previously populated ASDFDataSet.
         Useful for re-instantiating an existing workflow that has already 
@@ -463,6 +671,11 @@ class Manager:
         :param windows: load misfit windows from the dataset, defaults to False
         :type adjsrcs: bool
         :param adjsrcs: load adjoint sources from the dataset, defaults to False
+        :type cache: bool
+        :param cache: re-use the event and station data from previous loads of
+            the same dataset, and keep this load for later. A small number of
+            loads are kept, which can be released with Manager.clear_cache().
+            Set False to always read from the dataset, defaults to True
         """
         if code is None:
             logger.info("loading example data to Manager")
@@ -470,9 +683,9 @@ class Manager:
                                                             load_example_data() 
         else: 
             # Allows a ds to be provided outside the attribute
-            if self.ds and ds is None:
+            if ds is None:
                 ds = self.ds
-            else:
+            if ds is None:
                 raise TypeError("load requires a Dataset")
 
             # If no Config object in Manager, try to load from dataset
@@ -492,15 +705,15 @@ class Manager:
                 iter_, step = path.split("/")
 
             # Reset and populate using the dataset
-            self.__init__(config=self.config, ds=ds, event=ds.events[0])
+            self.__init__(config=self.config, ds=ds,
+                          event=self._load_event(ds, cache=cache))
             net, sta = code.split('.')
             sta_tag = f"{net}.{sta}"
             if sta_tag in ds.waveforms.list():
-                self.inv = ds.waveforms[sta_tag].StationXML
-                self.st_syn = ds.waveforms[sta_tag][synthetic_tag or
-                                                    self.config.synthetic_tag]
-                self.st_obs = ds.waveforms[sta_tag][observed_tag or
-                                                    self.config.observed_tag]
+                self.inv, self.st_obs, self.st_syn = self._load_station(
+                    ds, sta_tag, observed_tag or self.config.observed_tag,
+                    synthetic_tag or self.config.synthetic_tag, cache=cache
+                )
                 if windows:
                     self.windows = load_windows(ds, net, sta, iter_, step, 
                                                 return_previous=False)
@@ -512,6 +725,83 @@ class Manager:
         self.check()
         return self
 
+    @staticmethod
+    def _load_station(ds, sta_tag, observed_tag, synthetic_tag, cache=True):
+        """
+        Read station metadata and waveforms from a dataset, caching the
+        results so that subsequent loads of the same station skip the read.
+        Cache entries are keyed on the dataset filename, size and modification
+        time so that changes to the underlying file invalidate them.
+
+        .. note::
+            Copies of the cached inventory and streams are returned as the
+            Manager processes waveforms in place, and so that Managers do not
+            share mutable metadata
+
+        :type ds: pyasdf.asdf_data_set.ASDFDataSet
+        :param ds: dataset to load station data from
+        :type sta_tag: str
+        :param sta_tag: station tag in the dataset, e.g. 'NZ.BFZ'
+        :type observed_tag: str
+        :param observed_tag: waveform tag of the observed data
+        :type synthetic_tag: str
+        :param synthetic_tag: waveform tag of the synthetic data
+        :type cache: bool
+        :param cache: if False, read from the dataset without using the cache
+        :rtype: tuple
+        :return: (inv, st_obs, st_syn)
+        """
+        key = None
+        if cache:
+            key = _dataset_cache_key(ds, sta_tag, observed_tag, synthetic_tag)
+        if key is not None and key in _LOAD_CACHE:
+            _LOAD_CACHE.move_to_end(key)
+            inv, st_obs, st_syn = _LOAD_CACHE[key]
+        else:
+            inv = ds.waveforms[sta_tag].StationXML
+            st_obs = ds.waveforms[sta_tag][observed_tag]
+            st_syn = ds.waveforms[sta_tag][synthetic_tag]
+            _add_to_load_cache(key, (inv, st_obs, st_syn))
+
+        return deepcopy(inv), st_obs.copy(), st_syn.copy()
+
+    @staticmethod
+    def _load_event(ds, cache=True):
+        """
+        Read the Event from a dataset, caching the result in the same way as
+        Manager._load_station(), as parsing the QuakeML each time a station is
+        loaded for the same event is expensive.
+
+        .. note::
+            A copy of the cached Event is returned so that Managers can modify
+            it in place without affecting one another. Copying is still much
+            cheaper than parsing the QuakeML
+
+        :type ds: pyasdf.asdf_data_set.ASDFDataSet
+        :param ds: dataset to load the event from
+        :type cache: bool
+        :param cache: if False, read from the dataset without using the cache
+        :rtype: obspy.core.event.Event
+        :return: the first event stored in the dataset
+        """
+        key = _dataset_cache_key(ds, "event") if cache else None
+        if key is not None and key in _LOAD_CACHE:
+            _LOAD_CACHE.move_to_end(key)
+            event = _LOAD_CACHE[key]
+        else:
+            event = ds.events[0]
+            _add_to_load_cache(key, event)
+
+        return deepcopy(event)
+
+    @staticmethod
+    def clear_cache():
+        """
+        Empty the cache of station data read by Manager.load(), e.g. to free
+        memory after processing a large number of stations
+        """
+        _LOAD_CACHE.clear()
+
     def flow(self, standardize_to="syn", fix_windows=False, iteration=None,
              step_count=None, **kwargs):
         """
@@ -789,7 +1079,7 @@ class Manager:
         logger.info(f"syn time offset == {self.stats.time_offset_sec}s")
 
         # Calculate epicentral distance and backazimuth
-        if self.event and self.inv:
+        if self.event is not None and self.inv is not None:
             self.gcd, self.baz = gcd_and_baz(event=self.event,
                                              sta=self.inv[0][0])
 
@@ -857,6 +1147,13 @@ class Manager:
 
         # Apply preprocessing in-place on streams
         for key, st in preproc_list.items():
+            # Waveforms may be backed by read-only memory-mapped files, which
+            # are only copied into memory once they need to be modified
+            for tr in st:
+                if isinstance(tr.data, np.memmap) or \
+                        not tr.data.flags.writeable:
+                    tr.data = np.array(tr.data)
+
             # Remove response from 'obs' type data only
             if remove_response:
                 if (key == "obs" and self.config.st_obs_type == "obs") or (
@@ -898,11 +1195,19 @@ class Manager:
                 choice={"obs": "a", "syn": "b", "one": "one"}[normalize_to]
             )
 
+        # Single precision halves the memory that each downstream pass over
+        # the data (envelope, STA/LTA, misfit) needs to stream through
+        if self.config.use_float32:
+            for st in [self.st_obs, self.st_syn]:
+                for tr in st or []:
+                    tr.data = tr.data.astype(np.float32, copy=False)
+
         # Set stats post preprocessing
         self.stats.obs_processed = is_preprocessed(self.st_obs)
         self.stats.syn_processed = is_preprocessed(self.st_syn)
         self.stats.len_obs = len(self.st_obs)
         self.stats.len_syn = len(self.st_syn)
+        self._build_component_index()
 
         return self
 
@@ -954,20 +1259,14 @@ class Manager:
             # dataset for windows under the current iteration/step_count
             return_previous = False
 
-        # Synthetic STA/LTA as Pyflex WindowSelector.calculate_preliminaries()
-        for comp in self.config.component_list:
-            try:
-                self.staltas[comp] = pyflex.stalta.sta_lta(
-                    data=envelope(self.st_syn.select(component=comp)[0].data),
-                    dt=self.st_syn.select(component=comp)[0].stats.delta,
-                    min_period=self.config.min_period
-                )
-            except IndexError:
-                continue
-
         # Find misfit windows, from a dataset or through window selection
         if fix_windows:
             self.retrieve_windows(iteration, step_count, return_previous)
+            # Window selection provides the STA/LTA calculated internally by
+            # Pyflex, but for fixed windows we need to calculate it ourselves.
+            # Only used for plotting so allow skipping in headless workflows
+            if self.config.compute_staltas:
+                self.calculate_staltas()
         else:
             self.select_windows_plus()
 
@@ -975,6 +1274,22 @@ class Manager:
 
         return self
 
+    def calculate_staltas(self):
+        """
+        Calculate the synthetic STA/LTA for each component, following Pyflex
+        WindowSelector.calculate_preliminaries(). Used for plotting when
+        windows are not selected by Pyflex (e.g., fixed windows).
+        """
+        for comp in self.config.component_list:
+            try:
+                syn = self._get_trace("syn", comp)
+            except IndexError:
+                continue
+            self.staltas[comp] = pyflex.stalta.sta_lta(
+                data=envelope(syn.data), dt=syn.stats.delta,
+                min_period=self.config.min_period
+            )
+
     def retrieve_windows(self, iteration, step_count, return_previous):
         """
         Mid-level window selection function that retrieves windows from a 
@@ -1004,8 +1319,8 @@ class Manager:
         logger.debug("recalculating window criteria")
         for comp, windows_ in windows.items():
             try:
-                d = self.st_obs.select(component=comp)[0].data
-                s = self.st_syn.select(component=comp)[0].data
+                d = self._get_trace("obs", comp).data
+                s = self._get_trace("syn", comp).data
                 for w, win in enumerate(windows_):
                     # Post the old and new values to the logger for sanity check
                     logger.debug(f"{comp}{w}_old - "
@@ -1049,19 +1364,20 @@ class Manager:
         nwin, window_dict, reject_dict = 0, {}, {}
         for comp in self.config.component_list:
             try:
-                obs = self.st_obs.select(component=comp)[0]
-                syn = self.st_syn.select(component=comp)[0]
+                obs = self._get_trace("obs", comp)
+                syn = self._get_trace("syn", comp)
             # IndexError thrown when trying to access an empty Stream
             except IndexError:
                 continue
 
+            event, station = self._get_pyflex_srcrcv(net=obs.stats.network,
+                                                     sta=obs.stats.station)
             # Pyflex throws a TauP warning from ObsPy #2280, ignore that
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore", UserWarning)
-                ws = pyflex.WindowSelector(observed=obs, synthetic=syn,
-                                           config=self.config.pyflex_config,
-                                           event=self.event,
-                                           station=self.inv)
+                ws = CachedWindowSelector(observed=obs, synthetic=syn,
+                                          config=self.config.pyflex_config,
+                                          event=event, station=station)
                 try:
                     windows = ws.select_windows()
                 except (IndexError, pyflex.PyflexError):
@@ -1080,6 +1396,7 @@ class Manager:
             # ==================================================================
             # NOTE: Additional windowing criteria may be added here if necessary
             # ==================================================================
+            self.staltas[comp] = ws.stalta
             if windows:
                 window_dict[comp] = windows
             if ws.rejects:
@@ -1132,30 +1449,35 @@ class Manager:
         adjoint_windows = self._format_windows()
 
         # Run Pyadjoint to retrieve adjoint source objects
-        total_misfit, adjoint_sources = 0, {}
+        misfits, adjoint_sources = [], {}
+        log_misfits = logger.isEnabledFor(logging.INFO)
+        # Band code depends only on the sampling rate, shared by all components
+        band_code = channel_code(self.st_syn[0].stats.delta)
         for comp, adj_win in adjoint_windows.items():
             try:
                 adj_src = pyadjoint.calculate_adjoint_source(
                     config=self.config.pyadjoint_config,
-                    observed=self.st_obs.select(component=comp)[0],
-                    synthetic=self.st_syn.select(component=comp)[0],
+                    observed=self._get_trace("obs", comp),
+                    synthetic=self._get_trace("syn", comp),
                     windows=adj_win, plot=False
                     )
 
                 # Re-format component name to reflect SPECFEM convention
-                adj_src.component = f"{channel_code(adj_src.dt)}X{comp}"
+                adj_src.component = f"{band_code}X{comp}"
 
                 # Save adjoint sources in dictionary object. Sum total misfit
                 adjoint_sources[comp] = adj_src
-                logger.info(f"{comp}: {adj_src.misfit:.3f} misfit")
-                total_misfit += adj_src.misfit
+                misfits.append(adj_src.misfit)
+                if log_misfits:
+                    logger.info(f"{comp}: {adj_src.misfit:.3f} misfit")
             except IndexError:
                 continue
 
         # Save adjoint source internally and to dataset
         self.adjsrcs = adjoint_sources
+        self.stats.misfit = float(np.sum(misfits))
 
-        # Run check to get total misfit
+        # Run check to update remaining stats
         self.check()
         logger.info(f"total misfit == {self.stats.misfit:.3f}")
 
@@ -1175,20 +1497,20 @@ class Manager:
 
         if self.windows is not None:
             for comp, window in self.windows.items():
-                adjoint_windows[comp] = []
-                dt = self.st_obs.select(component=comp)[0].stats.delta
-                # Prepare Pyflex window indices to give to Pyadjoint
-                for win in window:
-                    # Window units given in seconds
-                    adj_win = [win.left * dt, win.right * dt]
-                    adjoint_windows[comp].append(adj_win)
+                dt = self._get_trace("obs", comp).stats.delta
+                # Prepare Pyflex window indices to give to Pyadjoint as a
+                # single array operation. Window units given in seconds
+                bounds = np.fromiter((b for win in window
+                                      for b in (win.left, win.right)),
+                                     dtype=np.int64, count=2 * len(window))
+                adjoint_windows[comp] = (bounds.reshape(-1, 2) * dt).tolist()
         # If no windows given, calculate adjoint source on whole trace
         else:
             logger.debug("no windows given, adjoint sources will be "
                          "calculated on full trace")
             for comp in self.config.component_list:
-                dt = self.st_obs.select(component=comp)[0].stats.delta
-                npts = self.st_obs.select(component=comp)[0].stats.npts
+                dt = self._get_trace("obs", comp).stats.delta
+                npts = self._get_trace("obs", comp).stats.npts
                 # We offset the bounds of the entire trace by 1s to play nice
                 # with PyAdjoints quirky method of generating the adjsrc. 
                 # The assumption being the end points will be zero anyway
@@ -1224,6 +1546,13 @@ class Manager:
         :type dpi: int
         :param dpi: optional dots per inch (resolution) of figure
         """
+        # Plotting imports are deferred as Cartopy is slow to import and not
+        # required for headless processing
+        import matplotlib as mpl
+        import matplotlib.pyplot as plt
+        from pyatoa.visuals.wave_maker import WaveMaker
+        from pyatoa.visuals.map_maker import MapMaker
+
         self.check()
 
         # Precheck for correct data to plot
@@ -1267,7 +1596,9 @@ class Manager:
             mm.plot(figure=fig, gridspec=gs, show=False, save=None)
 
             if save:
-                plt.savefig(save)
+                # Saving through the Figure skips the extra canvas redraw
+                # that pyplot performs after writing the file
+                fig.savefig(save)
             if show:
                 plt.show()
             else:
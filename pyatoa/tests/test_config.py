@@ -95,3 +95,20 @@ def test_incorrect_parameter_check():
             cfg = Config()
             setattr(cfg, key, value)
             cfg._check()
+
+
+def test_shallow_copy():
+    """
+    Ensure a shallow copy shares external configs but not top level attributes
+    """
+    from copy import copy
+
+    cfg = Config(event_id="abc", component_list=["Z", "N", "E"])
+    cfg_copy = copy(cfg)
+    cfg_copy.event_id = "def"
+    cfg_copy.component_list.append("R")
+
+    assert(cfg.event_id == "abc")
+    assert(cfg.component_list == ["Z", "N", "E"])
+    assert(cfg_copy.pyflex_config is cfg.pyflex_config)
+    assert(cfg_copy.pyadjoint_config is cfg.pyadjoint_config)
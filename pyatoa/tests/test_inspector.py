@@ -59,12 +59,20 @@ def test_discover(test_data):
     Make sure Inspector can find HDF5 files generally and read them in.
     """
     insp = Inspector()
-    insp.discover(path=test_data, ignore_symlinks=True)
+    insp.discover(path=test_data, ignore_symlinks=True, max_workers=2)
     assert(insp.events == "2018p130600")
     assert(insp.stations == "BFZ")
     assert(insp.iterations == "i01")
     assert(insp.evaluations == 1)
 
+    # Reading datasets in serial (the default) should collect the same
+    # information, and re-discovering the same datasets should not duplicate
+    serial_insp = Inspector()
+    serial_insp.discover(path=test_data)
+    assert(serial_insp.windows.equals(insp.windows))
+    insp.discover(path=test_data)
+    assert(len(insp.windows) == len(serial_insp.windows))
+
 
 def test_extend(inspector):
     """
@@ -140,6 +148,12 @@ def test_misfit(seisflows_inspector):
     for i, misfit in enumerate(insp.misfit().misfit.to_list()):
         assert(misfit == pytest.approx(check_list[i], .00001))
 
+    # Misfits are stored until new data are added to the Inspector
+    assert(insp.misfit() is insp.misfit())
+    misfit = insp.misfit()
+    insp.append("./test_data/2018p130600.h5")
+    assert(insp.misfit() is not misfit)
+
 
 def test_stats(seisflows_inspector):
     """
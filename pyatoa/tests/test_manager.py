@@ -3,6 +3,8 @@ Test the functionalities of the Pyaflowa Manager class
 """
 import pytest
 import os
+import numpy as np
+from glob import glob
 from pyasdf import ASDFDataSet
 from pyadjoint import get_config as get_pyadjoint_config
 from pyatoa import Config, Manager, logger
@@ -129,6 +131,61 @@ def test_read_write_from_asdfdataset(tmpdir, mgmt_pre, config):
     del ds
 
 
+def test_load_cache(tmpdir, mgmt_pre, config):
+    """
+    Repeated loads of the same station should be served from the cache, and
+    return copies that can be processed without affecting the cached data.
+    The event is cached separately and copied for each load, and the cache
+    can be cleared or skipped
+    """
+    from pyatoa.core.manager import _LOAD_CACHE
+
+    ds = ASDFDataSet(os.path.join(tmpdir, "test_dataset.h5"))
+    mgmt_pre.write_to_dataset(ds=ds)
+
+    Manager.clear_cache()
+    mgmt_a = Manager(ds=ds, config=config).load("NZ.BFZ", config=False)
+    assert(len(_LOAD_CACHE) == 2)
+    mgmt_a.st_obs[0].data *= 0
+
+    mgmt_b = Manager(ds=ds, config=config).load("NZ.BFZ", config=False)
+    assert(len(_LOAD_CACHE) == 2)
+    assert(mgmt_b.st_obs[0].data.any())
+    assert(mgmt_b.event == mgmt_a.event)
+    assert(mgmt_b.event is not mgmt_a.event)
+    assert(mgmt_b.inv is not mgmt_a.inv)
+
+    Manager.clear_cache()
+    assert(not _LOAD_CACHE)
+
+    # Loads can also bypass the cache entirely
+    Manager(ds=ds, config=config).load("NZ.BFZ", config=False, cache=False)
+    assert(not _LOAD_CACHE)
+
+    del ds
+
+
+def test_manager_stats():
+    """
+    Stats should behave as both attributes and dictionary keys, also after
+    being pickled and sent back from a worker process
+    """
+    import pickle
+    from copy import deepcopy
+    from pyatoa.core.manager import ManagerStats
+
+    stats = ManagerStats()
+    stats.misfit = 1.5
+    assert(stats["misfit"] == 1.5)
+    with pytest.raises(AttributeError):
+        stats.not_a_stat
+
+    for stats_copy in [pickle.loads(pickle.dumps(stats)), deepcopy(stats)]:
+        assert(stats_copy == stats)
+        stats_copy.nwin = 3
+        assert(stats_copy["nwin"] == 3)
+
+
 def test_standardize_to_synthetics(mgmt_pre):
     """
     Ensure that standardizing streams performs three main tasks, trimming
@@ -193,6 +250,34 @@ def test_preprocess_rotate_to_rtz(mgmt_pre):
     assert(float(f"{mgmt_pre.baz:.2f}") == 3.21)
 
 
+def test_preprocess_float32(mgmt_pre):
+    """
+    Ensure waveforms can be cast to single precision and still be measured
+    """
+    mgmt_pre.config.use_float32 = True
+    mgmt_pre.standardize().preprocess(remove_response=True, output="DISP")
+    for tr in mgmt_pre.st:
+        assert(tr.data.dtype == "float32")
+    mgmt_pre.window().measure()
+    assert(mgmt_pre.stats.misfit is not None)
+
+
+def test_preprocess_memmap(tmpdir, mgmt_pre):
+    """
+    Synthetics backed by read-only memory-mapped files should be copied into
+    memory before being processed in place
+    """
+    for i, tr in enumerate(mgmt_pre.st_syn):
+        fid = os.path.join(tmpdir, f"syn_{i}.npy")
+        np.save(fid, tr.data)
+        tr.data = np.load(fid, mmap_mode="r")
+
+    mgmt_pre.preprocess(which="syn")
+    assert mgmt_pre.stats.syn_processed
+    for tr in mgmt_pre.st_syn:
+        assert(not isinstance(tr.data, np.memmap))
+
+
 def test_select_window(mgmt_pre):
     """
     Ensure windows functionality works as advertised
@@ -208,6 +293,39 @@ def test_select_window(mgmt_pre):
         assert(len(mgmt_pre.windows[comp]) == nwin)
 
 
+def test_get_trace_component_index(mgmt_pre):
+    """
+    Ensure the internal component index returns the same traces as
+    Stream.select() and is rebuilt when the underlying streams change
+    """
+    mgmt_pre.standardize().preprocess()
+    for comp in mgmt_pre.config.component_list:
+        assert(mgmt_pre._get_trace("obs", comp) is
+               mgmt_pre.st_obs.select(component=comp)[0])
+
+    # Swapping out the stream should invalidate the index
+    mgmt_pre.st_syn = mgmt_pre.st_syn.copy()
+    assert(mgmt_pre._get_trace("syn", "Z") is
+           mgmt_pre.st_syn.select(component="Z")[0])
+
+    with pytest.raises(IndexError):
+        mgmt_pre._get_trace("obs", "R")
+
+
+def test_combined_stream_cache(mgmt_pre):
+    """
+    Ensure the combined Stream is re-used until its traces change
+    """
+    st = mgmt_pre.st
+    assert(mgmt_pre.st is st)
+    assert(len(st) == len(mgmt_pre.st_syn) + len(mgmt_pre.st_obs))
+
+    # Dropping a trace should rebuild the combined stream
+    mgmt_pre.st_obs.traces.pop()
+    assert(mgmt_pre.st is not st)
+    assert(len(mgmt_pre.st) == len(st) - 1)
+
+
 def test_save_and_retrieve_windows(tmpdir, mgmt_post):
     """
     Test retrieve_windows() and save_windows() by saving windows into a
@@ -265,6 +383,27 @@ def test_save_adjsrcs(tmpdir, mgmt_post):
     del ds
 
 
+def test_write_adjsrcs(tmpdir, mgmt_post):
+    """
+    Checks that adjoint sources are written as SPECFEM ascii files, with
+    zeroed files for components that have no adjoint source
+    """
+    comp, adj = next(iter(mgmt_post.adjsrcs.items()))
+    mgmt_post.adjsrcs = {comp: adj}
+    mgmt_post.write_adjsrcs(path=tmpdir, write_blanks=True)
+
+    fids = sorted(glob(os.path.join(tmpdir, "*.adj")))
+    assert(len(fids) == len(mgmt_post.config.component_list))
+    for fid in fids:
+        data = np.loadtxt(fid)
+        if fid.endswith(f"{adj.component}.adj"):
+            assert(data[:, 1].any())
+        else:
+            assert(not data[:, 1].any())
+    # Writing blanks must not zero out the original adjoint source
+    assert(adj.adjoint_source.any())
+
+
 def test_format_windows(mgmt_post):
     """
     Basic check that format windows returns as formatted lists expected
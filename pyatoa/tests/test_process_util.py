@@ -158,9 +158,35 @@ def test_is_preprocessed(st_obs):
     assert(process.is_preprocessed(st, filter_only=False) is True)
 
 
-def test_stf_convolve():
-    """
-    !!! TO DO
-    """
-    pass
-
+def test_stf_convolve(st_syn):
+    """
+    Frequency domain convolution of all traces at once should match
+    time domain convolution of each trace with a Gaussian STF
+    """
+    half_duration = 2.
+    st_check = st_syn.copy()
+    process.stf_convolve(st_syn, half_duration=half_duration)
+
+    # Regenerate the Gaussian STF to convolve in the time domain
+    hdur_samp = round(half_duration * st_check[0].stats.sampling_rate)
+    decay_rate = hdur_samp / 4.
+    t = np.arange(-hdur_samp, hdur_samp, 1)
+    stf = np.exp(-t ** 2 / decay_rate ** 2) / (np.sqrt(np.pi) * decay_rate)
+    for tr, tr_check in zip(st_syn, st_check):
+        expected = np.convolve(tr_check.data, stf, mode="same")
+        np.testing.assert_allclose(tr.data, expected,
+                                   atol=1E-10 * np.abs(expected).max())
+
+
+def test_filter_stacked_matches_obspy(st_syn):
+    """
+    Filtering all components at once as a stacked array should give the same
+    result as filtering trace by trace with ObsPy
+    """
+    st_check = st_syn.copy()
+    process.apply_filter(st_syn, min_period=10, max_period=30)
+    st_check.filter("bandpass", freqmin=1/30, freqmax=1/10, corners=2,
+                    zerophase=True)
+    for tr, tr_check in zip(st_syn, st_check):
+        np.testing.assert_allclose(tr.data, tr_check.data)
+    assert(process.is_preprocessed(st_syn))
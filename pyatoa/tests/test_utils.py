@@ -5,11 +5,14 @@ which get their own test suite.
 import os
 import shutil
 import pytest
+import pyflex
 import numpy as np
 from glob import glob
 from obspy import UTCDateTime, read_inventory
 from obspy.core.util.testing import streams_almost_equal
+from obspy.taup import TauPyModel
 from pyasdf import ASDFDataSet
+from pyatoa import Manager
 from pyatoa.utils import (adjoint, calculate, form, images, srcrcv, window, 
                           write)
 
@@ -122,7 +125,6 @@ def test_form_utils():
         assert(form.format_event_name(test_case) == eid)
 
 
-
 # ============================= TEST READ/ WRITE UTILS =========================
 
 
@@ -155,6 +157,20 @@ def test_write_utils(tmpdir, station_fid, sem_fid, ds):
     sta_adj = np.loadtxt(os.path.join(tmpdir, "STATIONS_ADJOINT"), dtype=str)
     assert(sta_adj[0] == "BFZ")
 
+    # An unchanged STATIONS_ADJOINT file should not be rewritten
+    mtime = os.stat(os.path.join(tmpdir, "STATIONS_ADJOINT")).st_mtime_ns
+    write.write_stations_adjoint(ds=ds, iteration="i01",
+                                 specfem_station_file=station_fid,
+                                 pathout=tmpdir
+                                 )
+    assert(os.stat(os.path.join(tmpdir, "STATIONS_ADJOINT")).st_mtime_ns ==
+           mtime)
+
+    # STATIONS files are parsed once and re-used until they change
+    stations = write.read_specfem_stations(station_fid)
+    assert(stations[0][0] == ("BFZ", "NZ"))
+    assert(write.read_specfem_stations(station_fid) is stations)
+
     # Test write_adj_src_to_ascii
     sta = "NZ_BFZ_BXN"
     fid = sta.replace("_", ".") + ".adj"
@@ -167,8 +183,30 @@ def test_write_utils(tmpdir, station_fid, sem_fid, ds):
     assert(max_val == pytest.approx(check_max, .1))
 
 # ============================= TEST SRCRCV UTILS ==============================
-# srcrcv functions are all pretty short, likely don't need a test
+def test_lonlat_utm():
+    """
+    Test conversion to UTM and back, which shares one projection per zone
+    """
+    x, y = srcrcv.lonlat_utm(174.5, -41.2)
+    assert(srcrcv.lonlat_utm(174.5, -41.2, utm_zone=-60) == (x, y))
+    lon, lat = srcrcv.lonlat_utm(x, y, utm_zone=-60, inverse=True)
+    assert(lon == pytest.approx(174.5) and lat == pytest.approx(-41.2))
 
-# ============================= TEST WINDOW UTILS ==============================
-# not enough window utils to warrant writing tests
 
+# ============================= TEST WINDOW UTILS ==============================
+def test_window_utils():
+    """
+    Test that window selection shares a single TauPy model per Earth model
+    """
+    model = window.get_taupy_model("ak135")
+    assert(window.get_taupy_model("ak135") is model)
+    assert(window.get_taupy_model("iasp91") is not model)
+
+    # Window selectors pick up the cached model, and leave Pyflex untouched
+    mgmt = Manager().load().standardize()
+    obs, syn = mgmt.st_obs[0], mgmt.st_syn[0]
+    ws = window.CachedWindowSelector(observed=obs, synthetic=syn,
+                                     config=mgmt.config.pyflex_config)
+    assert(ws.taupy_model is window.get_taupy_model(
+        mgmt.config.pyflex_config.earth_model))
+    assert(pyflex.window_selector.TauPyModel is TauPyModel)
@@ -79,43 +79,41 @@ def add_adjoint_sources(adjsrcs, ds, path, time_offset):
     """
     # Save adjoint sources per component
     for key, adj_src in adjsrcs.items():
+        # Create the standardized tag that identifies the adjoint source
+        # Assumes the component is formatted properly by the Manager
+        adj_src_tag = "_".join([adj_src.network,
+                                adj_src.station,
+                                adj_src.component])
+
+        # Convert the adjoint source to SPECFEM format
+        srclen = len(adj_src.adjoint_source)
+        specfem_adj_source = np.empty((srclen, 2), dtype=np.float64)
+
+        # Create the time axis in the 0th column
+        specfem_adj_source[:, 0] = np.linspace(0, (srclen - 1) * adj_src.dt,
+                                               srclen)
+        specfem_adj_source[:, 0] += time_offset
+
+        # Time-reverse waveform
+        specfem_adj_source[:, 1] = adj_src.adjoint_source[::-1]
+
+        # Parameters saved as a dictionary object to match the variables of
+        # the AdjointSource object, with additional identifiers
+        parameters = {"adj_src_type": adj_src.adjsrc_type,
+                      "misfit": adj_src.misfit,
+                      "dt": adj_src.dt,
+                      "component": adj_src.component,
+                      "min_period": adj_src.min_period or "None",
+                      "max_period": adj_src.max_period or "None",
+                      "network": adj_src.network,
+                      "station": adj_src.station,
+                      "location": adj_src.location,
+                      "starttime": str(adj_src.starttime)
+                      }
         with warnings.catch_warnings():
             warnings.simplefilter("ignore")
-            
-            # Create the standardized tag that identifies the adjoint source
-            # Assumes the component is formatted properly by the Manager
-            adj_src_tag = "_".join([adj_src.network,
-                                    adj_src.station,
-                                    adj_src.component])
-
-            # Convert the adjoint source to SPECFEM format
-            srclen = len(adj_src.adjoint_source)
-            specfem_adj_source = np.empty((srclen, 2))
-
-            # Create the time axis in the 0th column
-            specfem_adj_source[:, 0] = np.linspace(0, (srclen - 1) * adj_src.dt,
-                                                   srclen)
-            specfem_adj_source[:, 0] += time_offset
-
-            # Time-reverse waveform
-            specfem_adj_source[:, 1] = adj_src.adjoint_source[::-1]
-
-            # Parameters saved as a dictionary object to match the variables of
-            # the AdjointSource object, with additional identifiers
-            parameters = {"adj_src_type": adj_src.adjsrc_type,
-                          "misfit": adj_src.misfit,
-                          "dt": adj_src.dt,
-                          "component": adj_src.component,
-                          "min_period": adj_src.min_period or "None",
-                          "max_period": adj_src.max_period or "None",
-                          "network": adj_src.network,
-                          "station": adj_src.station,
-                          "location": adj_src.location,
-                          "starttime": str(adj_src.starttime)
-                          }
-            ds.add_auxiliary_data(data=specfem_adj_source.astype(np.float64),
+            ds.add_auxiliary_data(data=specfem_adj_source,
                                   data_type="AdjointSources",
                                   path=f"{path}/{adj_src_tag}",
                                   parameters=parameters
                                   )
-
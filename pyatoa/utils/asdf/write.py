@@ -10,6 +10,10 @@ from pyatoa.utils.form import format_event_name
 from pyatoa.utils.write import write_adj_src_to_ascii
 
 
+# Vectorized row formatter matching np.savetxt(fmt="%13.6f    %13.6E")
+_ascii_row = np.frompyfunc("{:13.6f}    {:13.6E}\n".format, 2, 1)
+
+
 def write_all(ds, path="./"):
     """
     Convenience function to dump everything inside a dataset
@@ -83,12 +87,13 @@ def write_waveforms(ds, path="./", station=None, tag=None, format="MSEED"):
                     # Determine the time offset from the event origin time
                     time_offset = tr.stats.starttime - origin_time
                     times = tr.times() + time_offset
-                    d = np.vstack((times, tr.data)).T
-                   
+
                     s = tr.stats 
                     fid = f"{s.network}.{s.station}.{s.channel}"
 
-                    np.savetxt(f"{fid}_{tag_}.ascii", d, fmt="%13.6f    %13.6E")
+                    # Format every row at once and write in a single call
+                    with open(f"{fid}_{tag_}.ascii", "w") as f:
+                        f.write("".join(_ascii_row(times, tr.data).tolist()))
 
 
 
@@ -146,8 +151,7 @@ def write_adjoint_sources(ds, path="./"):
     for model in adjsrcs.list():
         for step in adjsrcs[model].list():
             pathout = os.path.join(path, f"{model}{step}")
-            if not os.path.exists(pathout):
-                os.makedirs(pathout)
+            os.makedirs(pathout, exist_ok=True)
             write_adj_src_to_ascii(ds, model, step, pathout)
 
 
@@ -1,19 +1,23 @@
 """
 Utility functions for manipulating image files such as .png and .pdfs.
 Makes use use of the Python Pillow package if working with .png files, and 
-the PyPDF2 package if manipulating pdf files. Internal imports for all functions
+the pypdf package if manipulating pdf files. Internal imports for all functions
 to remove Pyatoa-wide dependencies on these packages for short functions.
 """
 import numpy as np
 from PIL import Image
-from pypdf import PdfMerger
+from pypdf import PdfWriter
 
 
 def merge_pdfs(fids, fid_out):
     """
-    Merge a list of pdfs into a single output pdf using the PyPDF2 package.
+    Merge a list of pdfs into a single output pdf using the pypdf package.
     Any desired order to the pdfs should be set in the list of input fids.
 
+    .. note::
+        Pages are appended to the page tree of the output document as they
+        are, so embedded images are not decoded or re-encoded
+
     :type fids: list
     :param fids: list of paths to .pdf files
     :type fid_out: str
@@ -22,12 +26,10 @@ def merge_pdfs(fids, fid_out):
     if not fids:
         return
 
-    merger = PdfMerger()
-    for fid in fids:
-        merger.append(fid)
-
-    merger.write(fid_out)
-    merger.close()
+    with PdfWriter() as writer:
+        for fid in fids:
+            writer.append(fid)
+        writer.write(fid_out)
 
 
 def imgs_to_pdf(fids, fid_out):
@@ -41,8 +43,11 @@ def imgs_to_pdf(fids, fid_out):
     """
     images = []
     for fid in fids:
-        # PNGs need to be converted to RGB to get alpha to play nice
-        images.append(Image.open(fid).convert("RGB"))
+        # PNGs need to be converted to RGB to get alpha to play nice. The
+        # converted copy lives in memory, so the file handle can be released
+        # right away rather than keeping one open per input file
+        with Image.open(fid) as im:
+            images.append(im.convert("RGB"))
 
     image_main = images[0]
     images = images[1:]
@@ -63,7 +68,8 @@ def tile_imgs(fids, fid_out):
     # .png files require conversion to properly get the alpha layer
     images = []
     for fid in fids:
-        images.append(Image.open(fid).convert("RGBA"))
+        with Image.open(fid) as im:
+            images.append(im.convert("RGBA"))
 
     widths, heights = zip(*(i.size for i in images))
     total_width = sum(widths)
@@ -5,6 +5,9 @@ Also contains tools for synthetic traces such as source time function
 convolutions
 """
 import numpy as np
+from functools import lru_cache
+from scipy.fft import next_fast_len, rfft, irfft
+from scipy.signal import iirfilter, sosfilt, zpk2sos
 from pyatoa import logger
 
 
@@ -54,26 +57,138 @@ def apply_filter(st, min_period=None, max_period=None, min_freq=None,
 
     # Bandpass if both bounds given
     if min_period and max_period:
-        st.filter("bandpass", corners=corners, zerophase=zerophase,
-                  freqmin=min_freq, freqmax=max_freq, **kwargs)
-        logger.info(f"bandpass filter: {min_period} - {max_period}s w/ "
-                    f"{corners} corners")
-
+        type_, options = "bandpass", {"freqmin": min_freq, "freqmax": max_freq}
+        msg = f"bandpass filter: {min_period} - {max_period}s"
     # Minimum period only == lowpass filter
     elif min_period:
-        st.filter("lowpass", freq=max_freq, corners=corners,
-                  zerophase=zerophase, **kwargs)
-        logger.info(f"lowpass filter: {min_period}s w/ {corners} corners")
-
+        type_, options = "lowpass", {"freq": max_freq}
+        msg = f"lowpass filter: {min_period}s"
     # Maximum period only == highpass filter
-    elif max_period:
-        st.filter("highpass", freq=min_freq, corners=corners, 
-                  zerophase=zerophase, **kwargs)
-        logger.info(f"highpass filter: {max_period}s w/ {corners} corners")
+    else:
+        type_, options = "highpass", {"freq": min_freq}
+        msg = f"highpass filter: {max_period}s"
+
+    # Filter all traces at once if possible, otherwise defer to ObsPy
+    if kwargs or not _filter_stacked(st, type_, corners=corners,
+                                     zerophase=zerophase, **options):
+        st.filter(type_, corners=corners, zerophase=zerophase, **options,
+                  **kwargs)
+    logger.info(f"{msg} w/ {corners} corners")
 
     return st
 
 
+def stack_stream(st):
+    """
+    Stack the data of a Stream into a single, contiguous 2D array with shape
+    (n_traces, npts), so that operations can be applied to all traces at once
+    rather than looping trace by trace. Only possible if all traces share
+    the same number of samples and sampling rate (i.e., they are standardized)
+
+    :type st: obspy.core.stream.Stream
+    :param st: stream to stack
+    :rtype: np.array or None
+    :return: 2D array of trace data, or None if the traces cannot be stacked
+    """
+    if not st:
+        return None
+    for tr in st[1:]:
+        if tr.stats.npts != st[0].stats.npts or \
+                tr.stats.sampling_rate != st[0].stats.sampling_rate:
+            return None
+
+    return np.vstack([tr.data for tr in st]).astype(np.float64, copy=False)
+
+
+def unstack_stream(st, data):
+    """
+    Inverse of `stack_stream`, write rows of a 2D array back into the
+    corresponding traces of a Stream, in place
+
+    :type st: obspy.core.stream.Stream
+    :param st: stream that `data` was stacked from
+    :type data: np.array
+    :param data: 2D array with shape (n_traces, npts)
+    """
+    for tr, row in zip(st, data):
+        tr.data = row
+
+
+@lru_cache(maxsize=128)
+def _butterworth_sos(corners, wn, type_):
+    """
+    Design a Butterworth filter as second-order sections, following
+    `obspy.signal.filter`. Filter design is identical for every station
+    processed with the same periods and sampling rate, so designs are cached.
+
+    :type corners: int
+    :param corners: number of filter corners
+    :type wn: float or tuple of float
+    :param wn: corner frequencies normalized by the Nyquist frequency, a tuple
+        of (low, high) for a bandpass
+    :type type_: str
+    :param type_: 'bandpass', 'lowpass' or 'highpass'
+    :rtype: np.array
+    :return: second-order sections representation of the filter
+    """
+    z, p, k = iirfilter(corners, wn, btype=type_.replace("pass", ""),
+                        ftype="butter", output="zpk")
+    return zpk2sos(z, p, k)
+
+
+def _filter_stacked(st, type_, corners, zerophase, **options):
+    """
+    Apply a Butterworth filter to all traces of a standardized stream at once.
+    Mirrors the implementation of `obspy.signal.filter` (zero-pole-gain design
+    converted to second-order sections, filtered forwards then backwards for
+    zerophase) so results are identical to `Stream.filter`.
+
+    Returns False and does nothing if the stream cannot be stacked, or if
+    the filter corners fall into edge cases (e.g., above Nyquist) that ObsPy
+    handles with its own warnings and adjustments.
+
+    :type st: obspy.core.stream.Stream
+    :param st: stream to filter in place
+    :type type_: str
+    :param type_: 'bandpass', 'lowpass' or 'highpass'
+    :type corners: int
+    :param corners: number of filter corners
+    :type zerophase: bool
+    :param zerophase: run the filter forwards and backwards
+    :rtype: bool
+    :return: True if the stream was filtered
+    """
+    data = stack_stream(st)
+    if data is None:
+        return False
+
+    nyquist = 0.5 * st[0].stats.sampling_rate
+    if type_ == "bandpass":
+        wn = [options["freqmin"] / nyquist, options["freqmax"] / nyquist]
+        if wn[1] - 1.0 > -1E-6 or wn[0] > 1:
+            return False
+    else:
+        wn = options["freq"] / nyquist
+        if wn > 1:
+            return False
+
+    if isinstance(wn, list):
+        wn = tuple(wn)
+    sos = _butterworth_sos(corners, wn, type_)
+    data = sosfilt(sos, data, axis=1)
+    if zerophase:
+        data = sosfilt(sos, data[:, ::-1], axis=1)[:, ::-1]
+    unstack_stream(st, np.ascontiguousarray(data))
+
+    # Processing stats are used downstream to determine if data is filtered
+    for tr in st:
+        tr.stats.setdefault("processing", []).append(
+            f"Pyatoa: filter(options={options}::type='{type_}')"
+        )
+
+    return True
+
+
 def taper_time_offset(st, taper_percentage=0.05, time_offset_sec=0):
     """
     Taper the leading edge of the waveform. If a time offset is given,
@@ -381,12 +496,25 @@ def stf_convolve(st, half_duration, source_decay=4., time_shift=None,
     if time_offset:
         time_offset_in_samp = int(time_offset * sampling_rate)
 
-    # convolve each trace with the soure time function and time shift if needed
-    for tr in st:
-        if time_shift:
+    if time_shift:
+        for tr in st:
             tr.stats.starttime += time_shift
-        data_out = np.convolve(tr.data, gaussian_stf, mode="same")
-        tr.data = data_out
+
+    # The source time function is the same for all traces, so if possible
+    # convolve all traces at once in the frequency domain. Output is trimmed
+    # to match the 'same' mode of np.convolve
+    data = stack_stream(st)
+    if data is not None and len(gaussian_stf) <= data.shape[1]:
+        npts, nstf = data.shape[1], len(gaussian_stf)
+        nfft = next_fast_len(npts + nstf - 1)
+        data_out = irfft(rfft(data, nfft, axis=1) * rfft(gaussian_stf, nfft),
+                         nfft, axis=1)
+        start = (nstf - 1) // 2
+        unstack_stream(st, np.ascontiguousarray(
+            data_out[:, start:start + npts]))
+    else:
+        for tr in st:
+            tr.data = np.convolve(tr.data, gaussian_stf, mode="same")
 
     return st
 
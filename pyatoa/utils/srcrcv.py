@@ -4,6 +4,7 @@ or their corresponding representations in ObsPy
 """
 import warnings
 import numpy as np
+from functools import lru_cache
 from obspy import UTCDateTime
 from obspy.geodetics import gps2dist_azimuth
 
@@ -23,8 +24,6 @@ def lonlat_utm(lon_or_x, lat_or_y, utm_zone=None, inverse=False):
     :rtype: tuple (float, float)
     :return: (x in UTM or longitude in WGS84, y in UTM or latitude in WGS84)
     """
-    from pyproj import Proj
-
     # If converting latlon to utm and no utm zone given, calculate utm zone
     if utm_zone is None and not inverse:
         utm_zone = utm_zone_from_lat_lon(lat_or_y, lon_or_x)
@@ -32,6 +31,27 @@ def lonlat_utm(lon_or_x, lat_or_y, utm_zone=None, inverse=False):
         raise TypeError(
             "lonlat_utm() missing 1 required positional argument: 'utm_zone'"
         )
+    projection = _utm_projection(int(utm_zone))
+
+    x_or_lon, y_or_lat = projection(lon_or_x, lat_or_y, inverse=inverse)
+
+    return x_or_lon, y_or_lat
+
+
+@lru_cache(maxsize=None)
+def _utm_projection(utm_zone):
+    """
+    Create the PyProj projection for a given UTM zone once and re-use it, as
+    parsing the projection string dominates the cost of converting a single
+    coordinate in lonlat_utm()
+
+    :type utm_zone: int
+    :param utm_zone: UTM zone, negative values for the southern hemisphere
+    :rtype: pyproj.Proj
+    :return: projection between WGS84 and the given UTM zone
+    """
+    from pyproj import Proj
+
     # Determine if the projection is north or south
     if utm_zone < 0:
         direction = "south"
@@ -41,13 +61,10 @@ def lonlat_utm(lon_or_x, lat_or_y, utm_zone=None, inverse=False):
     # Proj doesn't accept negative zones
     utm_zone = abs(utm_zone)
 
-    projstr = (f"+proj=utm +zone={utm_zone}, +{direction} +ellps=WGS84"
+    projstr = (f"+proj=utm +zone={utm_zone} +{direction} +ellps=WGS84"
                " +datum=WGS84 +units=m +no_defs")
-    projection = Proj(projstr)
-
-    x_or_lon, y_or_lat = projection(lon_or_x, lat_or_y, inverse=inverse)
 
-    return x_or_lon, y_or_lat
+    return Proj(projstr)
 
 
 def utm_zone_from_lat_lon(lat, lon):
@@ -195,7 +212,9 @@ def sort_by_backazimuth(ds, clockwise=True):
         _, baz = gcd_and_baz(event, sta)
         list_of_baz.append(baz)
 
-    list_of_baz, station_names = zip(*sorted(zip(list_of_baz, station_names)))
+    # Stable sort keeps the alphabetical order of stations with equal baz
+    order = np.argsort(list_of_baz, kind="stable")
+    station_names = [station_names[i] for i in order]
 
     if not clockwise:
         station_names.reverse()
@@ -7,7 +7,10 @@ Pyflex source code.
 Functions should work in place on a Manager class to avoid having to pass in
 all the different arguments from the Manager.
 """
+import pyflex
 import numpy as np
+from functools import lru_cache
+from obspy.taup import TauPyModel
 from pyatoa import logger
 from pyatoa.utils.calculate import abs_max
 
@@ -85,3 +88,51 @@ def reject_on_global_amplitude_ratio(data, windows, ratio=0.2):
                 )
 
     return accepted_windows, rejected_windows
+
+
+@lru_cache(maxsize=8)
+def get_taupy_model(model):
+    """
+    Load a TauPy Earth model once and share it between window selections.
+    Loading the model from disk dominates the setup cost of a Pyflex
+    WindowSelector, and sharing it also shares TauPy's internal cache of
+    models split at a given source depth between components and stations
+
+    :type model: str
+    :param model: name of the TauPy model, e.g. 'ak135'
+    :rtype: obspy.taup.TauPyModel
+    :return: the loaded TauPy model
+    """
+    return TauPyModel(model=model)
+
+
+class CachedWindowSelector(pyflex.WindowSelector):
+    """
+    A Pyflex WindowSelector that re-uses a cached TauPy model rather than
+    loading a new one from disk for every component that is windowed.
+    Otherwise identical to the Pyflex WindowSelector.
+    """
+    def __init__(self, observed, synthetic, config, event=None, station=None):
+        """
+        Calls pyflex.WindowSelector.__init__() with Pyflex's TauPyModel
+        temporarily swapped out for the cached model
+
+        :type observed: obspy.core.trace.Trace
+        :param observed: the preprocessed, observed waveform
+        :type synthetic: obspy.core.trace.Trace
+        :param synthetic: the preprocessed, synthetic waveform
+        :type config: pyflex.Config
+        :param config: Pyflex configuration object, copied internally
+        :type event: pyflex.Event
+        :param event: event information used for travel time calculations
+        :type station: pyflex.Station
+        :param station: station information used for travel time calculations
+        """
+        window_selector = pyflex.window_selector
+        taupy_model = window_selector.TauPyModel
+        window_selector.TauPyModel = lambda model: get_taupy_model(model)
+        try:
+            super().__init__(observed=observed, synthetic=synthetic,
+                             config=config, event=event, station=station)
+        finally:
+            window_selector.TauPyModel = taupy_model
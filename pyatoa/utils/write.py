@@ -3,11 +3,17 @@ For writing various output files used by Pyatoa, Specfem and Seisflows
 """
 import os
 import numpy as np
+from functools import lru_cache
 from obspy.core.inventory.channel import Channel
 from pyatoa import logger
 from pyatoa.utils.form import format_event_name, format_iter, format_step
 
 
+# Vectorized column formatters for Specfem ASCII adjoint sources
+_format_time = np.frompyfunc("{:13.6f}".format, 1, 1)
+_format_amp = np.frompyfunc("{:13.6E}".format, 1, 1)
+
+
 def write_inv_seed(inv, path="./", dir_structure="{sta}.{net}",
                    file_template="RESP.{net}.{sta}.{loc}.{cha}",
                    components="ZNE", channel_code="HX{comp}", **kwargs):
@@ -53,8 +59,7 @@ def write_inv_seed(inv, path="./", dir_structure="{sta}.{net}",
             sta_dir = os.path.join(path, dir_structure.format(sta=sta.code, 
                                                               net=net.code)
                                    )
-            if not os.path.exists(sta_dir):
-                os.makedirs(sta_dir)
+            os.makedirs(sta_dir, exist_ok=True)
           
             # If the station has no channels inherently, generate them on the 
             # fly based on default and user-defined information 
@@ -120,14 +125,17 @@ def write_misfit(ds, iteration, step_count=None, path="./", fidout=None):
     if fidout is None:
         fidout = os.path.join(path, format_event_name(ds))
     
-    # Collect the total misfit calculated by Pyadjoint
-    total_misfit = 0
+    # Collect the misfits calculated by Pyadjoint and reduce them in one go
     adjoint_sources = ds.auxiliary_data.AdjointSources[iter_tag]
     if step_tag:
         adjoint_sources = adjoint_sources[step_tag]
 
-    for adjsrc in adjoint_sources.list():
-        total_misfit += adjoint_sources[adjsrc].parameters["misfit"]
+    names = adjoint_sources.list()
+    misfits = np.fromiter(
+        (adjoint_sources[name].parameters["misfit"] for name in names),
+        dtype=np.float64, count=len(names)
+    )
+    total_misfit = np.sum(misfits)
 
     # Count up the number of misfit windows
     win = ds.auxiliary_data.MisfitWindows[iter_tag]
@@ -138,7 +146,8 @@ def write_misfit(ds, iteration, step_count=None, path="./", fidout=None):
     scaled_misfit = 0.5 * total_misfit / number_windows
 
     # save in the same format as seisflows 
-    np.savetxt(fidout, [scaled_misfit], '%11.6e')
+    with open(fidout, "w") as f:
+        f.write(f"{scaled_misfit:11.6e}\n")
 
     return scaled_misfit
 
@@ -163,7 +172,6 @@ def write_stations_adjoint(ds, iteration, specfem_station_file, step_count=None,
     :param pathout: path to save file 'STATIONS_ADJOINT'
     """
     # Check which stations have adjoint sources
-    stas_with_adjsrcs = []
     adj_srcs = ds.auxiliary_data.AdjointSources[format_iter(iteration)]
     # Dynamically determine final step count in the iteration
     if step_count is None:
@@ -173,13 +181,10 @@ def write_stations_adjoint(ds, iteration, specfem_station_file, step_count=None,
                 )
     adj_srcs = adj_srcs[format_step(step_count)]
 
-    for code in adj_srcs.list():
-        stas_with_adjsrcs.append(code.split('_')[1])
-    stas_with_adjsrcs = set(stas_with_adjsrcs)
-
-    # Figure out which stations were simulated
-    with open(specfem_station_file, "r") as f:
-        lines = f.readlines()
+    # Adjoint source tags are formatted NN_SSS_CCC, store as (SSS, NN) to
+    # match the column order of the STATIONS file
+    stas_with_adjsrcs = {tuple(code.split("_")[1::-1])
+                         for code in adj_srcs.list()}
 
     # If no output path is specified, save into current working directory with
     # an event_id tag to avoid confusion with other files, else normal naming
@@ -189,10 +194,59 @@ def write_stations_adjoint(ds, iteration, specfem_station_file, step_count=None,
         write_out = os.path.join(pathout, "STATIONS_ADJOINT")
 
     # Rewrite the Station file but only with stations that contain adjoint srcs
-    with open(write_out, "w") as f:
-        for line in lines:
-            if line.split()[0] in stas_with_adjsrcs:
-                    f.write(line)
+    stations = read_specfem_stations(specfem_station_file)
+    content = "".join(line for code, line in stations
+                      if code in stas_with_adjsrcs)
+
+    # The set of stations often does not change between evaluations, in which
+    # case the existing file is left untouched
+    if os.path.exists(write_out):
+        with open(write_out, "r") as f:
+            if f.read() == content:
+                return
+
+    # Write to a temporary file and then move it into place, so that the
+    # STATIONS_ADJOINT file is never seen partially written
+    write_tmp = f"{write_out}.tmp"
+    with open(write_tmp, "w") as f:
+        f.write(content)
+    os.replace(write_tmp, write_out)
+
+
+def read_specfem_stations(specfem_station_file):
+    """
+    Read a SPECFEM STATIONS file into (station, network) codes and their
+    original lines. The same STATIONS file is usually shared by every event,
+    so parsed files are cached, and re-read only if the file changes.
+
+    :type specfem_station_file: str
+    :param specfem_station_file: path/to/specfem/DATA/STATIONS
+    :rtype: tuple of ((str, str), str)
+    :return: ((station, network), line) for each station in the file
+    """
+    fstat = os.stat(specfem_station_file)
+    return _read_specfem_stations(os.path.abspath(specfem_station_file),
+                                  fstat.st_mtime_ns, fstat.st_size)
+
+
+@lru_cache(maxsize=8)
+def _read_specfem_stations(path, mtime_ns, size):
+    """
+    Cached reader for read_specfem_stations(). File modification time and size
+    are only used as part of the cache key
+    """
+    stations = []
+    with open(path, "r") as f:
+        for line in f:
+            # Only the station and network codes are needed, so stop splitting
+            # after the first two columns
+            parts = line.split(None, 2)
+            # Skip blank or malformed lines, which have no network column
+            if len(parts) < 2:
+                continue
+            stations.append(((parts[0], parts[1]), line))
+
+    return tuple(stations)
 
 
 def write_adj_src_to_ascii(ds, iteration, step_count=None, pathout=None, 
@@ -233,17 +287,15 @@ def write_adj_src_to_ascii(ds, iteration, step_count=None, pathout=None,
         :type array: numpy.ndarray
         :param array: array of data from obspy stream
         """
-        for dt, amp in array:
-            if dt == 0. and amp != 0.:
-                dt = 0
-                adj_formatter = "{dt:>13d}      {amp:13.6E}\n"
-            elif dt != 0. and amp == 0.:
-                amp = 0
-                adj_formatter = "{dt:13.6f}      {amp:>13d}\n"
-            else:
-                adj_formatter = "{dt:13.6f}      {amp:13.6E}\n"
-
-            f_.write(adj_formatter.format(dt=dt, amp=amp))
+        dt, amp = array[:, 0], array[:, 1]
+        dt_str = _format_time(dt)
+        amp_str = _format_amp(amp)
+
+        # Zero values are written as integers, unless both columns are zero
+        dt_str[(dt == 0.) & (amp != 0.)] = f"{0:>13d}"
+        amp_str[(dt != 0.) & (amp == 0.)] = f"{0:>13d}"
+
+        f_.write("".join((dt_str + "      " + amp_str + "\n").tolist()))
 
     # Shortcuts
     adjsrcs = ds.auxiliary_data.AdjointSources[format_iter(iteration)]
@@ -258,31 +310,37 @@ def write_adj_src_to_ascii(ds, iteration, step_count=None, pathout=None,
     # If no path is given, default to current working directory
     if pathout is None:
         pathout = os.path.join("./", format_event_name(ds))
-    if not os.path.exists(pathout):
-        os.makedirs(pathout)
+    os.makedirs(pathout, exist_ok=True)
 
     # Loop through adjoint sources and write out ascii files
     # ASDF datasets use '_' as separators but Specfem wants '.' as separators
-    already_written = []
-    for adj_src in adjsrcs.list():
+    # Sets, as membership is checked for each component of each adjoint source
+    adj_src_list = adjsrcs.list()
+    adj_src_names = set(adj_src_list)
+    already_written = set()
+    for adj_src in adj_src_list:
         station = adj_src.replace('_', '.')
         fid = os.path.join(pathout, f"{station}.adj")
+        data = adjsrcs[adj_src].data[()]
         with open(fid, "w") as f:
-            write_to_ascii(f, adjsrcs[adj_src].data[()])
+            write_to_ascii(f, data)
 
         # Write blank adjoint sources for components with no misfit windows
+        blank_adj_src = None
         for comp in list(comp_list):
             station_blank = (adj_src[:-1] + comp).replace('_', '.')
-            if station_blank.replace('.', '_') not in adjsrcs.list() and \
+            if station_blank.replace('.', '_') not in adj_src_names and \
                     station_blank not in already_written:
-                # Use the same adjoint source, but set the data to zeros
-                blank_adj_src = adjsrcs[adj_src].data[()]
-                blank_adj_src[:, 1] = np.zeros(len(blank_adj_src[:, 1]))
+                # Use the same adjoint source, but set the data to zeros.
+                # Only built once per adjoint source and shared by components
+                if blank_adj_src is None:
+                    blank_adj_src = data
+                    blank_adj_src[:, 1] = 0.
 
                 # Write out the blank adjoint source
                 fid_blank = os.path.join(pathout, f"{station_blank}.adj")
                 with open(fid_blank, "w") as b:
                     write_to_ascii(b, blank_adj_src)
 
-                # Append to a list to make sure we don't write doubles
-                already_written.append(station_blank)
+                # Keep track to make sure we don't write doubles
+                already_written.add(station_blank)
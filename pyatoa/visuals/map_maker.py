@@ -138,6 +138,13 @@ class MapMaker:
         .. note::
             kwargs passed to projection
             https://scitools.org.uk/cartopy/docs/v0.15/crs/projections.html
+
+        .. note::
+            The basemap is rebuilt for each figure, but Cartopy caches both
+            the coastline geometries and their projected paths per
+            projection. Projections are centered on the event, and compare
+            equal between maps of the same event, so repeated maps for one
+            event only pay for drawing, not for re-projecting coastlines
         """
         axis_linewidth = self.kwargs.get("axis_linewidth", 1.5)
         proj_str = self.kwargs.get("projection", "Stereographic")
@@ -364,7 +371,8 @@ class MapMaker:
         self.annotate()
         
         if save:
-            plt.savefig(save)
+            # Figure.savefig avoids the extra canvas redraw done by pyplot
+            self.fig.savefig(save)
         if show:
             plt.show()
 
@@ -685,7 +685,8 @@ class WaveMaker:
                         ax.set_ylabel("")
 
         if save:
-            plt.savefig(save)
+            # Figure.savefig avoids the extra canvas redraw done by pyplot
+            self.fig.savefig(save)
         if show:
             plt.show()
 